@@ -2,14 +2,28 @@
 
 from __future__ import annotations
 
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
 
 # Chunking parameters
 CHUNK_SIZE = 800  # characters (~256 tokens)
 CHUNK_OVERLAP = 160  # 20% overlap
 MIN_CHUNK_SIZE = 100  # minimum chunk size
 
+# Batches at least this large run in worker processes (see map_in_pool)
+POOL_MIN_DOCUMENTS = 32
+POOL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 @dataclass
 class Chunk:
@@ -254,6 +268,45 @@ def chunk_for_embedding(
     return truncated
 
 
+def _chunk_dicts(doc: tuple[str, str]) -> list[dict[str, Any]]:
+    fulltext, title = doc
+    return [c.to_dict() for c in chunk_document(fulltext, title)]
+
+
+def chunk_documents(docs: list[tuple[str, str]]) -> list[list[dict[str, Any]]]:
+    """chunk_document() for many (fulltext, title) pairs, as chunk dicts.
+
+    Segmentation is pure-Python CPU work; large batches run in a process
+    pool so they use several cores and don't hold the server's GIL.
+    """
+    return map_in_pool(_chunk_dicts, docs)
+
+
+def map_in_pool(fn: Callable[[T], R], items: list[T]) -> list[R]:
+    """[fn(item) for item in items], in worker processes for large batches.
+
+    fn must be a module-level function (it is pickled by reference).
+    """
+    if len(items) < POOL_MIN_DOCUMENTS or POOL_MAX_WORKERS < 2:
+        return [fn(item) for item in items]
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=POOL_MAX_WORKERS)
+        pool = _pool
+    return list(pool.map(fn, items, chunksize=8))
+
+
+def shutdown_chunk_pool() -> None:
+    """Stop the worker processes (app shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
 def get_chunking_info() -> dict:
     """Get information about chunking parameters for admin UI."""
     return {
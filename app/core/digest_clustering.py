@@ -12,6 +12,7 @@ from __future__ import annotations
 import json
 import logging
 import math
+import operator
 import random
 from dataclasses import dataclass, field
 from typing import Any
@@ -73,14 +74,20 @@ class ClusteringResult:
         }
 
 
-def _cosine_similarity(v1: list[float], v2: list[float]) -> float:
-    """Compute cosine similarity between two vectors."""
-    dot = sum(a * b for a, b in zip(v1, v2))
-    norm1 = math.sqrt(sum(a * a for a in v1))
-    norm2 = math.sqrt(sum(b * b for b in v2))
-    if norm1 == 0 or norm2 == 0:
-        return 0.0
-    return dot / (norm1 * norm2)
+try:
+    _dot = math.sumprod  # Python 3.12+, single C loop
+except AttributeError:
+
+    def _dot(v1: list[float], v2: list[float]) -> float:
+        return sum(map(operator.mul, v1, v2))
+
+
+def _normalize(v: list[float]) -> list[float]:
+    """Scale to unit length, so cosine similarity becomes a plain dot product."""
+    norm = math.sqrt(_dot(v, v))
+    if norm == 0:
+        return list(v)
+    return [x / norm for x in v]
 
 
 def _kmeans_cluster(
@@ -90,6 +97,9 @@ def _kmeans_cluster(
 ) -> list[int]:
     """Simple k-means clustering for embeddings.
 
+    Vectors (and centroids) are kept at unit length, so each similarity
+    in the hot loops is a single dot product.
+
     Args:
         embeddings: List of embedding vectors
         k: Number of clusters
@@ -104,37 +114,37 @@ def _kmeans_cluster(
     if n <= k:
         return list(range(n))
 
-    dim = len(embeddings[0])
+    vectors = [_normalize(emb) for emb in embeddings]
 
-    # Initialize centroids using k-means++ style
-    centroid_indices = [random.randint(0, n - 1)]
+    # Initialize centroids using k-means++ style: repeatedly pick the point
+    # farthest from its nearest centroid (distances updated incrementally)
+    first = random.randint(0, n - 1)
+    centroid_indices = [first]
+    min_dist = [1 - _dot(v, vectors[first]) for v in vectors]
     for _ in range(1, k):
-        # Find point farthest from existing centroids
         max_dist = -1.0
         max_idx = 0
-        for i, emb in enumerate(embeddings):
+        for i, dist in enumerate(min_dist):
             if i in centroid_indices:
                 continue
-            min_dist = min(
-                1 - _cosine_similarity(emb, embeddings[c])
-                for c in centroid_indices
-            )
-            if min_dist > max_dist:
-                max_dist = min_dist
+            if dist > max_dist:
+                max_dist = dist
                 max_idx = i
         centroid_indices.append(max_idx)
+        newest = vectors[max_idx]
+        min_dist = [min(d, 1 - _dot(v, newest)) for d, v in zip(min_dist, vectors)]
 
-    centroids = [embeddings[i][:] for i in centroid_indices]
+    centroids = [vectors[i] for i in centroid_indices]
     assignments = [0] * n
 
     for iteration in range(max_iterations):
         # Assign points to nearest centroid
         new_assignments = []
-        for emb in embeddings:
+        for v in vectors:
             best_cluster = 0
             best_sim = -2.0
             for c_idx, centroid in enumerate(centroids):
-                sim = _cosine_similarity(emb, centroid)
+                sim = _dot(v, centroid)
                 if sim > best_sim:
                     best_sim = sim
                     best_cluster = c_idx
@@ -145,19 +155,11 @@ def _kmeans_cluster(
             break
         assignments = new_assignments
 
-        # Update centroids
+        # Update centroids (the mean direction; length doesn't matter for cosine)
         for c_idx in range(k):
-            cluster_points = [
-                embeddings[i] for i, a in enumerate(assignments) if a == c_idx
-            ]
+            cluster_points = [vectors[i] for i, a in enumerate(assignments) if a == c_idx]
             if cluster_points:
-                new_centroid = [0.0] * dim
-                for point in cluster_points:
-                    for d in range(dim):
-                        new_centroid[d] += point[d]
-                for d in range(dim):
-                    new_centroid[d] /= len(cluster_points)
-                centroids[c_idx] = new_centroid
+                centroids[c_idx] = _normalize([sum(column) for column in zip(*cluster_points)])
 
     return assignments
 
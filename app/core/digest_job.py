@@ -11,7 +11,6 @@ The structure mirrors pipeline_job.py for consistency.
 
 from __future__ import annotations
 
-import json
 import logging
 import threading
 import uuid
@@ -20,6 +19,8 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
 
+from app.core.sse import sse_message
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,7 +54,7 @@ class DigestEventType(str, Enum):
     DIGEST_FAILED = "digest_failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class DigestEvent:
     """Event emitted during digest generation for SSE streaming."""
 
@@ -62,7 +63,7 @@ class DigestEvent:
     data: dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def to_sse(self) -> str:
+    def to_sse(self) -> bytes:
         """Format as Server-Sent Event."""
         event_data = {
             "type": self.type.value,
@@ -70,10 +71,10 @@ class DigestEvent:
             "timestamp": self.timestamp.isoformat(),
             **self.data,
         }
-        return f"event: {self.type.value}\ndata: {json.dumps(event_data)}\n\n"
+        return sse_message(self.type.value, event_data)
 
 
-@dataclass
+@dataclass(slots=True)
 class DigestJob:
     """Tracks state of a digest generation job."""
 
@@ -8,8 +8,9 @@ import logging
 import time
 
 from app.core.embeddings import get_embeddings_batch, serialize_f32
-from app.core.embedding_providers import get_provider, EmbeddingError
+from app.core.embedding_providers import embed_cached, get_provider, EmbeddingError
 from app.core.chunking import chunk_document, chunk_for_embedding
+from app.core.query_cache import clear_search_cache
 from app.core.storage import get_db
 from app.core.settings import Settings
 
@@ -80,6 +81,8 @@ async def generate_embeddings_batch(limit: int = 100) -> dict[str, int]:
             failed += len(batch)
             logger.error(f"Batch embedding failed: {e}")
 
+    if processed:
+        clear_search_cache()
     stats = db.get_embedding_stats()
     return {"processed": processed, "failed": failed, "remaining": stats["pending"]}
 
@@ -181,27 +184,22 @@ async def generate_embeddings_v2(
 
         start_time = time.monotonic()
         try:
-            embeddings = await provider.embed(texts)
+            embeddings, sent = await embed_cached(db, provider, provider.name.lower(), texts)
             latency_ms = int((time.monotonic() - start_time) * 1000)
 
-            # Estimate tokens (rough)
-            batch_tokens = sum(len(t) // 4 for t in texts)
+            # Estimate tokens (rough); cache hits cost nothing
+            batch_tokens = sum(len(texts[j]) // 4 for j in sent)
             total_tokens += batch_tokens
             batch_cost = provider.estimate_cost(batch_tokens)
             total_cost += batch_cost
 
             # Prepare batch data for single-transaction save (fixes SQLite concurrency)
             embeddings_data = []
-            for doc_id, embedding in zip(doc_ids, embeddings):
-                try:
-                    embedding_bytes = serialize_f32(embedding)
-                    embeddings_data.append({
-                        "embedding": embedding_bytes,
-                        "document_id": doc_id,
-                    })
-                except Exception as e:
-                    failed += 1
-                    logger.error(f"Failed to serialize embedding for doc {doc_id}: {e}")
+            for doc_id, embedding_bytes in zip(doc_ids, embeddings):
+                embeddings_data.append({
+                    "embedding": embedding_bytes,
+                    "document_id": doc_id,
+                })
 
             # Save all embeddings in single transaction
             if embeddings_data:
@@ -254,6 +252,9 @@ async def generate_embeddings_v2(
             failed += len(batch)
             logger.error(f"Batch embedding failed: {e}")
 
+    if processed:
+        clear_search_cache()
+
     # Optionally generate chunk embeddings
     chunks_processed = 0
     if include_chunks and processed > 0:
@@ -317,14 +318,15 @@ async def generate_chunk_embeddings_v2(
     docs_to_chunk = cur.fetchall()
 
     chunks_created = 0
-    for doc_id, title, fulltext in docs_to_chunk:
-        if not fulltext:
-            continue
-        chunks = chunk_document(fulltext, title or "")
-        if chunks:
-            db.save_chunks(doc_id, [c.to_dict() for c in chunks])
-            chunks_created += len(chunks)
-            logger.info(f"Created {len(chunks)} chunks for document {doc_id}")
+    with db.conn:
+        for doc_id, title, fulltext in docs_to_chunk:
+            if not fulltext:
+                continue
+            chunks = chunk_document(fulltext, title or "")
+            if chunks:
+                db.save_chunks(doc_id, [c.to_dict() for c in chunks])
+                chunks_created += len(chunks)
+                logger.info(f"Created {len(chunks)} chunks for document {doc_id}")
 
     # Now get chunks without embeddings for this provider/model
     cur = db.conn.execute(
@@ -364,26 +366,21 @@ async def generate_chunk_embeddings_v2(
 
         start_time = time.monotonic()
         try:
-            embeddings = await provider.embed(texts)
+            embeddings, sent = await embed_cached(db, provider, provider.name.lower(), texts)
             latency_ms = int((time.monotonic() - start_time) * 1000)
 
-            batch_tokens = sum(len(t) // 4 for t in texts)
+            batch_tokens = sum(len(texts[j]) // 4 for j in sent)
             total_tokens += batch_tokens
             batch_cost = provider.estimate_cost(batch_tokens)
             total_cost += batch_cost
 
             # Prepare batch data for single-transaction save (fixes SQLite concurrency)
             embeddings_data = []
-            for chunk_id, embedding in zip(chunk_ids, embeddings):
-                try:
-                    embedding_bytes = serialize_f32(embedding)
-                    embeddings_data.append({
-                        "embedding": embedding_bytes,
-                        "chunk_id": chunk_id,
-                    })
-                except Exception as e:
-                    failed += 1
-                    logger.error(f"Failed to serialize embedding for chunk {chunk_id}: {e}")
+            for chunk_id, embedding_bytes in zip(chunk_ids, embeddings):
+                embeddings_data.append({
+                    "embedding": embedding_bytes,
+                    "chunk_id": chunk_id,
+                })
 
             # Save all embeddings in single transaction
             if embeddings_data:
@@ -421,6 +418,9 @@ async def generate_chunk_embeddings_v2(
             failed += len(batch)
             logger.error(f"Chunk embedding batch failed: {e}")
 
+    if processed or chunks_created:
+        clear_search_cache()
+
     return {
         "processed": processed,
         "failed": failed,
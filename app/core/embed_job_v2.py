@@ -19,6 +19,9 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import TYPE_CHECKING, Any, AsyncIterator
 
+from app.core.query_cache import clear_search_cache
+from app.core.sse import sse_message
+
 if TYPE_CHECKING:
     from app.core.storage import DB
 
@@ -48,7 +51,7 @@ class EmbedEventType(str, Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbedEvent:
     """Event emitted during embedding job for SSE streaming."""
 
@@ -57,20 +60,18 @@ class EmbedEvent:
     data: dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def to_sse(self) -> str:
+    def to_sse(self) -> bytes:
         """Format as Server-Sent Event."""
-        import json
-
         event_data = {
             "type": self.type.value,
             "job_id": self.job_id,
             "timestamp": self.timestamp.isoformat(),
             **self.data,
         }
-        return f"event: {self.type.value}\ndata: {json.dumps(event_data)}\n\n"
+        return sse_message(self.type.value, event_data)
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbedJob:
     """Tracks state of an embedding job."""
 
@@ -358,7 +359,7 @@ async def run_embed_job(
     from app.core.embedding_providers import (
         OpenAIProvider,
         EmbeddingError,
-        serialize_f32,
+        embed_cached,
         OPENAI_MODELS,
     )
 
@@ -434,17 +435,17 @@ async def run_embed_job(
 
             # Extract texts for embedding
             texts = [c["chunk_text"] for c in chunks]
-            batch_tokens = sum(c["token_count"] for c in chunks)
 
             try:
-                # Call OpenAI API
-                embeddings = await provider.embed(texts)
+                # Call OpenAI API for texts not already in embedding_cache
+                embeddings, sent = await embed_cached(db, provider, job.provider, texts)
+                batch_tokens = sum(chunks[i]["token_count"] for i in sent)
 
                 # Prepare batch data for saving
                 embeddings_data = []
                 for i, chunk in enumerate(chunks):
                     embeddings_data.append({
-                        "embedding": serialize_f32(embeddings[i]),
+                        "embedding": embeddings[i],
                         "chunk_id": chunk["id"],
                     })
 
@@ -505,3 +506,8 @@ async def run_embed_job(
             job_id=job.id,
             data={"error": str(e), **job.to_dict()},
         )
+
+    finally:
+        # New vectors change semantic search results
+        if job.items_succeeded:
+            clear_search_cache()
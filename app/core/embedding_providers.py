@@ -7,11 +7,16 @@ import logging
 import os
 import struct
 from abc import ABC, abstractmethod
+from array import array
+from collections.abc import AsyncIterator, Sequence
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import httpx
 
+if TYPE_CHECKING:
+    from app.core.storage import DB
+
 logger = logging.getLogger(__name__)
 
 # Retry settings for rate limits
@@ -20,8 +25,14 @@ INITIAL_DELAY = 2.0  # seconds
 MAX_DELAY = 60.0  # seconds
 
 
-def serialize_f32(vector: list[float]) -> bytes:
-    """Serialize a list of floats into bytes for sqlite-vec."""
+def serialize_f32(vector: Sequence[float]) -> bytes:
+    """Serialize a list of floats into bytes for sqlite-vec.
+
+    A float32 ``array('f')`` (as decoded from base64 API responses) is
+    already in the target layout and is copied as-is.
+    """
+    if isinstance(vector, array) and vector.typecode == "f":
+        return vector.tobytes()
     return struct.pack(f"{len(vector)}f", *vector)
 
 
@@ -250,9 +261,9 @@ class OpenAIProvider(EmbeddingProvider):
                         embedding = item["embedding"]
                         # Decode base64 if needed
                         if use_base64 and isinstance(embedding, str):
-                            b64_bytes = base64.b64decode(embedding)
-                            # Each float32 is 4 bytes
-                            embedding = list(struct.unpack(f'{len(b64_bytes)//4}f', b64_bytes))
+                            # Raw little-endian float32s: keep them as array('f')
+                            # so serialize_f32 is a plain copy, no per-float parsing
+                            embedding = array("f", base64.b64decode(embedding))
                         embeddings[item["index"]] = embedding
 
                     return embeddings  # type: ignore
@@ -317,8 +328,31 @@ class OpenAIProvider(EmbeddingProvider):
         Returns:
             List of embedding vectors in the same order as input.
         """
+        all_embeddings: list[Sequence[float] | None] = [None] * len(texts)
+        processed = 0
+
+        async for start, embeddings in self.embed_parallel_stream(texts, batch_size, max_concurrent):
+            all_embeddings[start : start + len(embeddings)] = embeddings
+            processed += len(embeddings)
+            if on_batch_complete:
+                on_batch_complete(processed, len(texts))
+
+        return all_embeddings  # type: ignore
+
+    async def embed_parallel_stream(
+        self,
+        texts: list[str],
+        batch_size: int = 1000,
+        max_concurrent: int = 10,
+    ) -> AsyncIterator[tuple[int, list[Sequence[float]]]]:
+        """Like embed_parallel(), but yield each batch as soon as it is done.
+
+        Yields (start index into texts, embeddings) in completion order, so
+        callers can save finished batches while other requests are in flight.
+        An EmbeddingError from any batch is raised and the rest are cancelled.
+        """
         if not texts:
-            return []
+            return
 
         if not self._api_key:
             raise EmbeddingError(
@@ -327,33 +361,22 @@ class OpenAIProvider(EmbeddingProvider):
                 retriable=False,
             )
 
-        # Split into batches
-        batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
-        all_embeddings: list[list[float] | None] = [None] * len(texts)
-        processed = 0
-
-        # Process batches in parallel waves
         semaphore = asyncio.Semaphore(max_concurrent)
 
-        async def process_batch(batch_idx: int, batch_texts: list[str]) -> None:
-            nonlocal processed
+        async def process_batch(start: int) -> tuple[int, list[Sequence[float]]]:
             async with semaphore:
-                start_idx = batch_idx * batch_size
-                try:
-                    embeddings = await self.embed(batch_texts)
-                    for i, emb in enumerate(embeddings):
-                        all_embeddings[start_idx + i] = emb
-                    processed += len(batch_texts)
-                    if on_batch_complete:
-                        on_batch_complete(processed, len(texts))
-                except EmbeddingError:
-                    raise  # Don't catch embedding errors
-
-        # Run all batches
-        tasks = [process_batch(i, batch) for i, batch in enumerate(batches)]
-        await asyncio.gather(*tasks)
+                return start, await self.embed(texts[start : start + batch_size])
 
-        return all_embeddings  # type: ignore
+        tasks = [
+            asyncio.ensure_future(process_batch(start))
+            for start in range(0, len(texts), batch_size)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def embed_single(self, text: str) -> list[float]:
         """Get embedding for a single text."""
@@ -610,3 +633,31 @@ def get_all_models() -> dict[str, dict[str, ModelInfo]]:
         "openai": OPENAI_MODELS,
         "ollama": OLLAMA_MODELS,
     }
+
+
+async def embed_cached(
+    db: DB, provider: EmbeddingProvider, provider_name: str, texts: list[str]
+) -> tuple[list[bytes], list[int]]:
+    """Embed texts, reusing vectors from embedding_cache for identical text.
+
+    Only texts without a cached vector are sent to the provider, in one
+    request. Returns the serialized vectors (in input order) and the
+    indexes of the texts that were actually sent, for cost accounting.
+    """
+    from app.core.storage import embedding_content_hash
+
+    hashes = [embedding_content_hash(t) for t in texts]
+    vectors = db.get_cached_embeddings(provider_name, provider.model_id, hashes)
+
+    misses: dict[bytes, int] = {}
+    for i, h in enumerate(hashes):
+        if h not in vectors:
+            misses.setdefault(h, i)
+
+    if misses:
+        embedded = await provider.embed([texts[i] for i in misses.values()])
+        fresh = {h: serialize_f32(v) for h, v in zip(misses, embedded)}
+        db.cache_embeddings(provider_name, provider.model_id, fresh)
+        vectors.update(fresh)
+
+    return [vectors[h] for h in hashes], list(misses.values())
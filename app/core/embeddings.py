@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import logging
 import os
 import struct
+from array import array
+from collections.abc import Sequence
 
 import httpx
 
@@ -17,12 +20,25 @@ INITIAL_DELAY = 2.0  # seconds
 MAX_DELAY = 60.0  # seconds
 
 
-def serialize_f32(vector: list[float]) -> bytes:
-    """Serialize a list of floats into bytes for sqlite-vec."""
+def serialize_f32(vector: Sequence[float]) -> bytes:
+    """Serialize a list of floats into bytes for sqlite-vec.
+
+    A float32 ``array('f')`` (as decoded from base64 API responses) is
+    already in the target layout and is copied as-is.
+    """
+    if isinstance(vector, array) and vector.typecode == "f":
+        return vector.tobytes()
     return struct.pack(f"{len(vector)}f", *vector)
 
 
-async def get_embedding(text: str) -> list[float]:
+def _decode_embedding(value: str | list[float]) -> Sequence[float]:
+    """base64 API embedding -> array('f') (raw little-endian float32s)."""
+    if isinstance(value, str):
+        return array("f", base64.b64decode(value))
+    return value
+
+
+async def get_embedding(text: str) -> Sequence[float]:
     """Get embedding for a single text using OpenAI API.
 
     Uses text-embedding-3-small model (1536 dimensions).
@@ -31,7 +47,7 @@ async def get_embedding(text: str) -> list[float]:
         text: The text to embed. Will be truncated if too long.
 
     Returns:
-        List of 1536 floats representing the embedding.
+        1536 floats as a float32 array('f'), ready for serialize_f32().
 
     Raises:
         ValueError: If OPENAI_API_KEY is not set.
@@ -58,15 +74,16 @@ async def get_embedding(text: str) -> list[float]:
             json={
                 "model": model,
                 "input": text,
+                "encoding_format": "base64",
             },
         )
         response.raise_for_status()
         data = response.json()
 
-    return data["data"][0]["embedding"]
+    return _decode_embedding(data["data"][0]["embedding"])
 
 
-async def get_embeddings_batch(texts: list[str]) -> list[list[float]]:
+async def get_embeddings_batch(texts: list[str]) -> list[Sequence[float]]:
     """Get embeddings for multiple texts in a single API call.
 
     More efficient than calling get_embedding() multiple times.
@@ -110,6 +127,7 @@ async def get_embeddings_batch(texts: list[str]) -> list[list[float]]:
                     json={
                         "model": model,
                         "input": truncated,
+                        "encoding_format": "base64",
                     },
                 )
                 response.raise_for_status()
@@ -118,7 +136,7 @@ async def get_embeddings_batch(texts: list[str]) -> list[list[float]]:
                 # API returns embeddings in order, but let's be safe
                 embeddings = [None] * len(texts)
                 for item in data["data"]:
-                    embeddings[item["index"]] = item["embedding"]
+                    embeddings[item["index"]] = _decode_embedding(item["embedding"])
 
                 return embeddings
 
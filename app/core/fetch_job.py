@@ -21,6 +21,8 @@ from enum import Enum
 from typing import TYPE_CHECKING, Any, AsyncIterator
 
 from app.core.content_fetcher import ContentFetcher, FetchResult, FetchErrorType
+from app.core.query_cache import clear_search_cache
+from app.core.sse import sse_message
 
 # Optional trafilatura cache reset for memory optimization
 try:
@@ -33,6 +35,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Max seconds a running job's progress may lag behind in the DB
+PERSIST_INTERVAL = 1.0
+
 
 class FetchStatus(str, Enum):
     """Status of a fetch job."""
@@ -60,7 +65,7 @@ class FetchEventType(str, Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class FetchEvent:
     """Event emitted during fetch job for SSE streaming."""
 
@@ -69,20 +74,18 @@ class FetchEvent:
     data: dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def to_sse(self) -> str:
+    def to_sse(self) -> bytes:
         """Format as Server-Sent Event."""
-        import json
-
         event_data = {
             "type": self.type.value,
             "job_id": self.job_id,
             "timestamp": self.timestamp.isoformat(),
             **self.data,
         }
-        return f"event: {self.type.value}\ndata: {json.dumps(event_data)}\n\n"
+        return sse_message(self.type.value, event_data)
 
 
-@dataclass
+@dataclass(slots=True)
 class FetchJob:
     """Tracks state of a fulltext fetch job."""
 
@@ -150,6 +153,8 @@ class FetchJobStore:
     def __init__(self, conn: sqlite3.Connection) -> None:
         self._conn = conn
         self._jobs: dict[str, FetchJob] = {}
+        # job id -> (monotonic time, status) of the last DB write
+        self._persisted: dict[str, tuple[float, FetchStatus]] = {}
         self._lock = threading.Lock()
         self._load_from_db()
 
@@ -182,6 +187,7 @@ class FetchJobStore:
 
     def _persist(self, job: FetchJob) -> None:
         """Save or update job in DB. Must be called within lock."""
+        self._persisted[job.id] = (time.monotonic(), job.status)
         self._conn.execute(
             """
             INSERT INTO fetch_jobs (
@@ -221,11 +227,19 @@ class FetchJobStore:
             return self._jobs.get(job_id)
 
     def update(self, job: FetchJob) -> None:
-        """Update job in store and persist to DB."""
+        """Update job in store; persist to DB on status change, else at most
+        every PERSIST_INTERVAL seconds (progress counters/cursors).
+        """
         job.touch()
         with self._lock:
             self._jobs[job.id] = job
-            self._persist(job)
+            last = self._persisted.get(job.id)
+            if (
+                last is None
+                or last[1] != job.status
+                or time.monotonic() - last[0] >= PERSIST_INTERVAL
+            ):
+                self._persist(job)
 
     def list_all(self) -> list[FetchJob]:
         """List all jobs in memory, newest first."""
@@ -297,11 +311,26 @@ class FetchJobStore:
     def delete(self, job_id: str) -> bool:
         """Delete job by ID from memory and DB. Returns True if deleted."""
         with self._lock:
-            if job_id in self._jobs:
-                del self._jobs[job_id]
-            cur = self._conn.execute("DELETE FROM fetch_jobs WHERE id = ?", (job_id,))
-            self._conn.commit()
-            return cur.rowcount > 0
+            return self._delete(job_id)
+
+    def try_delete(self, job_id: str) -> bool | None:
+        """Delete a job unless it is running (checked under the same lock).
+
+        Returns None if the job is running, else whether it was deleted.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job and job.status == FetchStatus.RUNNING:
+                return None
+            return self._delete(job_id)
+
+    def _delete(self, job_id: str) -> bool:
+        """Must be called within lock."""
+        self._jobs.pop(job_id, None)
+        self._persisted.pop(job_id, None)
+        cur = self._conn.execute("DELETE FROM fetch_jobs WHERE id = ?", (job_id,))
+        self._conn.commit()
+        return cur.rowcount > 0
 
 
 class DomainRateLimiter:
@@ -547,6 +576,9 @@ async def run_fetch_job(
 
     finally:
         await fetcher.close()
+        # Fetched fulltext is FTS-indexed; cached search results are stale
+        if job.items_succeeded:
+            clear_search_cache()
 
 
 # Global store instance
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import sqlite3
 import threading
+import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -13,6 +14,9 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from app.core.storage import DB
 
+# Max seconds a running job's progress may lag behind in the DB
+PERSIST_INTERVAL = 1.0
+
 
 class ImportStatus(str, Enum):
     """Status of an import job."""
@@ -25,7 +29,7 @@ class ImportStatus(str, Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportJob:
     """Tracks state of a streaming import from Readwise APIs."""
 
@@ -91,6 +95,8 @@ class ImportJobStore:
     def __init__(self, conn: sqlite3.Connection) -> None:
         self._conn = conn
         self._jobs: dict[str, ImportJob] = {}
+        # job id -> (monotonic time, status) of the last DB write
+        self._persisted: dict[str, tuple[float, ImportStatus]] = {}
         self._lock = threading.Lock()
         # Load incomplete jobs from DB on init
         self._load_from_db()
@@ -123,6 +129,7 @@ class ImportJobStore:
 
     def _persist(self, job: ImportJob) -> None:
         """Save or update job in DB. Must be called within lock."""
+        self._persisted[job.id] = (time.monotonic(), job.status)
         self._conn.execute(
             """
             INSERT INTO import_jobs (
@@ -166,11 +173,19 @@ class ImportJobStore:
             return self._jobs.get(job_id)
 
     def update(self, job: ImportJob) -> None:
-        """Update job in store and persist to DB."""
+        """Update job in store; persist to DB on status change, else at most
+        every PERSIST_INTERVAL seconds (progress counters/cursors).
+        """
         job.touch()
         with self._lock:
             self._jobs[job.id] = job
-            self._persist(job)
+            last = self._persisted.get(job.id)
+            if (
+                last is None
+                or last[1] != job.status
+                or time.monotonic() - last[0] >= PERSIST_INTERVAL
+            ):
+                self._persist(job)
 
     def list_all(self) -> list[ImportJob]:
         """List all jobs in memory, newest first."""
@@ -12,7 +12,6 @@ for real-time UI updates.
 
 from __future__ import annotations
 
-import json
 import logging
 import sqlite3
 import threading
@@ -23,6 +22,8 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import TYPE_CHECKING, Any, AsyncIterator
 
+from app.core.sse import sse_message
+
 if TYPE_CHECKING:
     from app.core.storage import DB
 
@@ -65,7 +66,7 @@ class PipelineEventType(str, Enum):
     HEARTBEAT = "heartbeat"  # Regular status ping during long operations
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineEvent:
     """Event emitted during pipeline execution for SSE streaming."""
 
@@ -74,7 +75,7 @@ class PipelineEvent:
     data: dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def to_sse(self) -> str:
+    def to_sse(self) -> bytes:
         """Format as Server-Sent Event."""
         event_data = {
             "type": self.type.value,
@@ -82,7 +83,7 @@ class PipelineEvent:
             "timestamp": self.timestamp.isoformat(),
             **self.data,
         }
-        return f"event: {self.type.value}\ndata: {json.dumps(event_data)}\n\n"
+        return sse_message(self.type.value, event_data)
 
 
 @dataclass
@@ -143,8 +144,17 @@ class PipelineJobStore:
 
     def __init__(self) -> None:
         self._jobs: dict[str, PipelineJob] = {}
+        # Newest first; replaced (never mutated) when jobs are added or
+        # removed, so list_all() reads it without taking the lock
+        self._snapshot: tuple[PipelineJob, ...] = ()
         self._lock = threading.Lock()
 
+    def _publish(self) -> None:
+        """Rebuild the list_all() snapshot. Must be called within lock."""
+        self._snapshot = tuple(
+            sorted(self._jobs.values(), key=lambda j: j.started_at, reverse=True)
+        )
+
     def create(self) -> PipelineJob:
         """Create a new pending pipeline job."""
         job = PipelineJob(
@@ -153,6 +163,7 @@ class PipelineJobStore:
         )
         with self._lock:
             self._jobs[job.id] = job
+            self._publish()
         return job
 
     def get(self, job_id: str) -> PipelineJob | None:
@@ -164,7 +175,9 @@ class PipelineJobStore:
         """Update job in store."""
         job.touch()
         with self._lock:
-            self._jobs[job.id] = job
+            if self._jobs.get(job.id) is not job:
+                self._jobs[job.id] = job
+                self._publish()
 
     def pause(self, job_id: str) -> PipelineJob | None:
         """Pause a running job."""
@@ -193,6 +206,7 @@ class PipelineJobStore:
         with self._lock:
             if job_id in self._jobs:
                 del self._jobs[job_id]
+                self._publish()
                 return True
             return False
 
@@ -206,12 +220,7 @@ class PipelineJobStore:
 
     def list_all(self) -> list[PipelineJob]:
         """List all jobs, newest first."""
-        with self._lock:
-            return sorted(
-                self._jobs.values(),
-                key=lambda j: j.started_at,
-                reverse=True,
-            )
+        return list(self._snapshot)
 
 
 # Global store instance
@@ -261,6 +270,14 @@ def check_control_status(
 HEARTBEAT_INTERVAL = 2.0  # seconds
 
 
+def _optimize_fts(db: DB) -> None:
+    """Background FTS segment merge after a sync (see DB.optimize_fts)."""
+    try:
+        db.optimize_fts()
+    except sqlite3.Error as e:
+        logger.warning(f"FTS optimize failed: {e}")
+
+
 async def run_pipeline(
     job: PipelineJob,
     db: "DB",
@@ -344,7 +361,9 @@ def _run_pipeline_sync(
     from app.core.import_job import ImportStatus, get_import_store
     from app.core.embed_job_v2 import EmbedStatus, get_embed_store, run_embed_job
     from app.core.chunking import chunk_document
-    from app.providers.readwise import ReadwiseClient, ImportEvent, ImportEventType
+    from app.core.query_cache import clear_search_cache
+    from app.core.storage import sql_now
+    from app.providers.readwise import ImportEvent, ImportEventType, get_readwise_client
 
     job.status = PipelineStatus.RUNNING
     store.update(job)
@@ -374,6 +393,8 @@ def _run_pipeline_sync(
 
             items_processed = 0
             last_heartbeat = time.monotonic()
+            # Shared created_at/updated_at for the current progress batch
+            batch_now = sql_now()
 
             # Get last sync timestamp for incremental import
             last_sync_str = db.get_setting("last_sync_at")
@@ -387,38 +408,40 @@ def _run_pipeline_sync(
                     logger.warning(f"Invalid last_sync_at value: {last_sync_str}, doing full sync")
 
             url_index: dict[str, str] = {}
-            with ReadwiseClient(token=token) as client:
-                for event in client.stream_import(import_job, url_index=url_index, updated_after=updated_after):
-                    # Heartbeat for long-running operations
-                    if time.monotonic() - last_heartbeat > HEARTBEAT_INTERVAL:
-                        yield PipelineEvent(
-                            type=PipelineEventType.HEARTBEAT,
-                            phase=PipelinePhase.IMPORT,
-                            data={"items_processed": items_processed, "status": "processing"},
-                        )
-                        last_heartbeat = time.monotonic()
-
-                    # Check for pause/cancel inside loop for responsiveness
-                    stop_event = check_control_status(job, store, PipelinePhase.IMPORT)
-                    if stop_event:
-                        if stop_event.type == PipelineEventType.PIPELINE_PAUSED:
-                            import_store.pause(import_job.id)
-                        else:
-                            import_store.cancel(import_job.id)
-                        yield stop_event
-                        return
-
-                    # Process import events
-                    if event.type == ImportEventType.ITEM:
-                        items_processed += 1
-                        last_heartbeat = time.monotonic()
-                        # Save article and highlights to DB
-                        article_data = event.data.get("article", {})
-                        if article_data.get("provider_id"):
-                            from app.core.content_fetcher import extract_text_from_html
-
-                            html_content = article_data.get("html_content")
-                            clean_text = extract_text_from_html(html_content) if html_content else None
+            client = get_readwise_client(token)
+            for event in client.stream_import(import_job, url_index=url_index, updated_after=updated_after):
+                # Heartbeat for long-running operations
+                if time.monotonic() - last_heartbeat > HEARTBEAT_INTERVAL:
+                    yield PipelineEvent(
+                        type=PipelineEventType.HEARTBEAT,
+                        phase=PipelinePhase.IMPORT,
+                        data={"items_processed": items_processed, "status": "processing"},
+                    )
+                    last_heartbeat = time.monotonic()
+
+                # Check for pause/cancel inside loop for responsiveness
+                stop_event = check_control_status(job, store, PipelinePhase.IMPORT)
+                if stop_event:
+                    if stop_event.type == PipelineEventType.PIPELINE_PAUSED:
+                        import_store.pause(import_job.id)
+                    else:
+                        import_store.cancel(import_job.id)
+                    yield stop_event
+                    return
+
+                # Process import events
+                if event.type == ImportEventType.ITEM:
+                    items_processed += 1
+                    last_heartbeat = time.monotonic()
+                    # Save article and highlights to DB
+                    article_data = event.data.get("article", {})
+                    if article_data.get("provider_id"):
+                        from app.core.content_fetcher import extract_text_from_html
+
+                        html_content = article_data.get("html_content")
+                        clean_text = extract_text_from_html(html_content) if html_content else None
+                        # One commit per item (article + its highlights)
+                        with db.conn:
                             doc_id = db.save_article(
                                 source=article_data.get("provider", "unknown"),
                                 provider_id=article_data.get("provider_id", ""),
@@ -433,43 +456,43 @@ def _run_pipeline_sync(
                                 fulltext_html=html_content,
                                 fulltext_source="readwise" if clean_text else None,
                                 summary=article_data.get("summary"),
+                                now=batch_now,
                             )
                             # Save highlights if present
-                            highlights = event.data.get("highlights", [])
-                            for hl in highlights:
-                                if hl.get("provider_id") and hl.get("text"):
-                                    db.save_highlight(
-                                        document_id=doc_id,
-                                        provider_highlight_id=hl["provider_id"],
-                                        text=hl["text"],
-                                        note=hl.get("note"),
-                                        highlighted_at=hl.get("highlighted_at"),
-                                        provider=hl.get("provider"),
-                                    )
-
-                    elif event.type == ImportEventType.PROGRESS:
-                        job.docs_imported = import_job.items_imported
-                        job.docs_merged = import_job.items_merged
-                        store.update(job)
-                        last_heartbeat = time.monotonic()
-
-                        yield PipelineEvent(
-                            type=PipelineEventType.PHASE_PROGRESS,
-                            phase=PipelinePhase.IMPORT,
-                            data={
-                                "docs_imported": job.docs_imported,
-                                "docs_merged": job.docs_merged,
-                                "items_total": import_job.items_total,
-                            },
-                        )
-
-                    elif event.type == ImportEventType.ERROR:
-                        logger.warning(f"Import error: {event.data}")
-
-                    elif event.type == ImportEventType.COMPLETED:
-                        # Rebuild FTS after import
-                        db.rebuild_fts()
-                        break
+                            db.save_highlights(
+                                doc_id,
+                                [
+                                    {**hl, "provider_highlight_id": hl["provider_id"]}
+                                    for hl in event.data.get("highlights", [])
+                                    if hl.get("provider_id") and hl.get("text")
+                                ],
+                            )
+
+                elif event.type == ImportEventType.PROGRESS:
+                    batch_now = sql_now()
+                    job.docs_imported = import_job.items_imported
+                    job.docs_merged = import_job.items_merged
+                    store.update(job)
+                    last_heartbeat = time.monotonic()
+
+                    yield PipelineEvent(
+                        type=PipelineEventType.PHASE_PROGRESS,
+                        phase=PipelinePhase.IMPORT,
+                        data={
+                            "docs_imported": job.docs_imported,
+                            "docs_merged": job.docs_merged,
+                            "items_total": import_job.items_total,
+                        },
+                    )
+
+                elif event.type == ImportEventType.ERROR:
+                    logger.warning(f"Import error: {event.data}")
+
+                elif event.type == ImportEventType.COMPLETED:
+                    # FTS is already current (documents_* triggers);
+                    # cached search results are not
+                    clear_search_cache()
+                    break
 
             # Ensure we always send a progress event, even if no items were imported
             if items_processed == 0:
@@ -543,18 +566,20 @@ def _run_pipeline_sync(
                     yield stop_event
                     return
 
-                for doc in docs:
-                    if doc["fulltext"]:
-                        chunks = chunk_document(
-                            fulltext=doc["fulltext"],
-                            title=doc["title"] or "",
-                        )
-                        if chunks:
-                            db.save_chunks(
-                                document_id=doc["id"],
-                                chunks=[c.to_dict() for c in chunks],
+                # One commit per batch
+                with db.conn:
+                    for doc in docs:
+                        if doc["fulltext"]:
+                            chunks = chunk_document(
+                                fulltext=doc["fulltext"],
+                                title=doc["title"] or "",
                             )
-                            chunks_created += len(chunks)
+                            if chunks:
+                                db.save_chunks(
+                                    document_id=doc["id"],
+                                    chunks=[c.to_dict() for c in chunks],
+                                )
+                                chunks_created += len(chunks)
 
                 docs_processed += len(docs)
                 job.chunks_created = chunks_created
@@ -573,6 +598,9 @@ def _run_pipeline_sync(
                 # Get next batch
                 docs = db.get_documents_for_chunking(limit=batch_size)
 
+        if chunks_created:
+            clear_search_cache()
+
         yield PipelineEvent(
             type=PipelineEventType.PHASE_COMPLETE,
             phase=PipelinePhase.CHUNK,
@@ -698,7 +726,9 @@ def _run_pipeline_sync(
             data={"message": "Aktualisiere Suchindex..."},
         )
 
-        indexed_count = db.rebuild_fts()
+        # The documents_* triggers keep FTS current; only segment merging is
+        # left, and that runs in the background once the pipeline is done
+        indexed_count = db.count_fts_documents()
 
         yield PipelineEvent(
             type=PipelineEventType.PHASE_COMPLETE,
@@ -713,9 +743,15 @@ def _run_pipeline_sync(
 
         # Save last_sync_at for incremental sync next time
         from datetime import datetime
-        db.set_setting("last_sync_at", datetime.utcnow().isoformat())
+        with db.conn:
+            db.set_setting("last_sync_at", datetime.utcnow().isoformat())
         logger.info("Saved last_sync_at timestamp for incremental sync")
 
+        # Last pipeline write is done; later writers wait for the merge
+        threading.Thread(
+            target=_optimize_fts, args=(db,), name="fts-optimize", daemon=True
+        ).start()
+
         yield PipelineEvent(
             type=PipelineEventType.PIPELINE_COMPLETE,
             phase=PipelinePhase.DONE,
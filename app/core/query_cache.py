@@ -0,0 +1,122 @@
+"""Caches for repeated searches.
+
+Saved digest queries are re-run for every badge and results panel on the
+digest pages. Results are cached per (query, limit) for a short TTL and
+dropped entirely whenever documents are (re)imported.
+
+Semantic searches also cache the query embedding, which costs an OpenAI
+round-trip. Embeddings don't depend on the library, so those entries only
+age out via LRU. Concurrent misses for the same query (e.g. the library
+page and its results partial) share one in-flight request. Full semantic
+search results are cached like keyword results, so a repeated query skips
+both the embedding and the KNN scan.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from app.core.embeddings import get_embedding, serialize_f32
+
+if TYPE_CHECKING:
+    from app.core.storage import DB
+
+CACHE_MAX_ENTRIES = 512
+CACHE_TTL_SECONDS = 60.0
+EMBEDDING_CACHE_MAX_ENTRIES = 256
+
+_cache: OrderedDict[tuple[str, int], tuple[float, list[dict[str, Any]]]] = OrderedDict()
+_semantic: OrderedDict[tuple[str, str, int], tuple[float, list[dict[str, Any]]]] = OrderedDict()
+_embeddings: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+_inflight: dict[tuple[str, str], asyncio.Future[bytes]] = {}
+_lock = threading.Lock()
+
+
+def search_documents_cached(db: DB, q: str, limit: int = 50) -> list[dict[str, Any]]:
+    """db.search_documents() with a TTL + LRU cache keyed by normalized query.
+
+    Only whitespace is normalized: FTS5 operators (OR, NOT, AND) are
+    case-sensitive, so "a OR b" and "a or b" are different queries.
+    """
+    key = (" ".join((q or "").split()), limit)
+    now = time.monotonic()
+
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] > now:
+            _cache.move_to_end(key)
+            return hit[1]
+
+    results = db.search_documents(q, limit=limit)
+
+    with _lock:
+        _cache[key] = (now + CACHE_TTL_SECONDS, results)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return results
+
+
+async def get_query_embedding_cached(q: str) -> bytes:
+    """serialize_f32(get_embedding(q)), cached per (model, whitespace-normalized q)."""
+    text = " ".join(q.split())
+    key = (os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"), text)
+
+    with _lock:
+        hit = _embeddings.get(key)
+        if hit is not None:
+            _embeddings.move_to_end(key)
+            return hit
+
+        task = _inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(_embed(text))
+            _inflight[key] = task
+            task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # shield: a cancelled request must not cancel the embedding for the others
+    embedding = await asyncio.shield(task)
+
+    with _lock:
+        _embeddings[key] = embedding
+        _embeddings.move_to_end(key)
+        while len(_embeddings) > EMBEDDING_CACHE_MAX_ENTRIES:
+            _embeddings.popitem(last=False)
+    return embedding
+
+
+async def semantic_search_cached(db: DB, q: str, limit: int = 10) -> list[dict[str, Any]]:
+    """db.semantic_search() for q, cached like search_documents_cached()."""
+    key = (os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"), " ".join(q.split()), limit)
+
+    with _lock:
+        hit = _semantic.get(key)
+        if hit is not None and hit[0] > time.monotonic():
+            _semantic.move_to_end(key)
+            return hit[1]
+
+    embedding = await get_query_embedding_cached(q)
+    results = db.semantic_search(embedding, limit=limit)
+
+    with _lock:
+        _semantic[key] = (time.monotonic() + CACHE_TTL_SECONDS, results)
+        _semantic.move_to_end(key)
+        while len(_semantic) > CACHE_MAX_ENTRIES:
+            _semantic.popitem(last=False)
+    return results
+
+
+async def _embed(text: str) -> bytes:
+    return serialize_f32(await get_embedding(text))
+
+
+def clear_search_cache() -> None:
+    """Drop all cached results (call after documents change)."""
+    with _lock:
+        _cache.clear()
+        _semantic.clear()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass(frozen=True)
@@ -19,7 +20,9 @@ class Settings:
     ollama_base_url: str  # Ollama server URL
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def from_env() -> "Settings":
+        """Settings from the environment, read once per process."""
         def _b(name: str, default: str) -> bool:
             return os.getenv(name, default).strip() in ("1", "true", "True", "yes", "YES")
 
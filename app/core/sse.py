@@ -0,0 +1,82 @@
+"""Server-Sent Event formatting shared by the job streams."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+# orjson is optional - encodes event payloads in C when installed
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None  # type: ignore
+
+# Progress events are coalesced into one send per window (see batch_sse)
+SSE_BATCH_BYTES = 16 * 1024
+SSE_BATCH_SECONDS = 0.05
+
+
+def sse_message(event: str, data: Any) -> bytes:
+    """Format one SSE message with a JSON data line.
+
+    Returned as bytes: orjson already encodes, and StreamingResponse sends
+    bytes as-is, so the payload is never decoded and re-encoded.
+    """
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data).encode()
+    return b"event: %s\ndata: %s\n\n" % (event.encode(), payload)
+
+
+async def batch_sse(
+    messages: AsyncIterator[bytes],
+    max_bytes: int = SSE_BATCH_BYTES,
+    max_delay: float = SSE_BATCH_SECONDS,
+) -> AsyncIterator[bytes]:
+    """Coalesce SSE messages into fewer response chunks.
+
+    A chunk is sent once it reaches max_bytes or max_delay after its first
+    message, and at the end of the stream. EventSource parses several
+    messages per chunk, so clients see the same events.
+    """
+    loop = asyncio.get_running_loop()
+    buf = bytearray()
+    deadline = 0.0
+    # The pending __anext__ survives a flush timeout; cancelling it would
+    # abort the job generator mid-step.
+    pending: asyncio.Future[bytes] | None = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(messages))
+            timeout = max(deadline - loop.time(), 0) if buf else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                yield bytes(buf)
+                buf.clear()
+                continue
+
+            task, pending = pending, None
+            try:
+                message = task.result()
+            except StopAsyncIteration:
+                break
+
+            if not buf:
+                deadline = loop.time() + max_delay
+            buf.extend(message)
+            if len(buf) >= max_bytes:
+                yield bytes(buf)
+                buf.clear()
+
+        if buf:
+            yield bytes(buf)
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -4,11 +4,15 @@ import hashlib
 import json
 import logging
 import os
+import queue
 import sqlite3
 import struct
+import threading
 import unicodedata
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator
 from urllib.parse import urlparse, urlunparse
 
 import sqlite_vec
@@ -19,6 +23,15 @@ from app.core.settings import Settings
 from app.core.categories import normalize_category
 
 
+def sql_now() -> str:
+    """Current UTC time in SQLite's ``datetime('now')`` format.
+
+    Computed once on the host and bound as a parameter, so bulk writes
+    don't call SQLite's date function per row.
+    """
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
 def normalize_url(url: str | None) -> str | None:
     """Normalize URL for deduplication.
 
@@ -65,6 +78,11 @@ def text_hash(text: str) -> str:
     return hashlib.sha256(normalized.encode()).hexdigest()[:16]
 
 
+def embedding_content_hash(text: str) -> bytes:
+    """Key for embedding_cache: sha256 of the exact text sent to the provider."""
+    return hashlib.sha256(text.encode()).digest()
+
+
 SCHEMA_SQL = """
 PRAGMA journal_mode=WAL;
 
@@ -143,6 +161,9 @@ CREATE TABLE IF NOT EXISTS import_jobs (
   error TEXT
 );
 
+-- list_recent(): ORDER BY started_at DESC LIMIT n liest nur den Index
+CREATE INDEX IF NOT EXISTS idx_import_jobs_started_at ON import_jobs(started_at);
+
 CREATE TABLE IF NOT EXISTS highlights (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
   document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
@@ -192,6 +213,17 @@ CREATE INDEX IF NOT EXISTS idx_embeddings_chunk_id ON embeddings(chunk_id);
 CREATE INDEX IF NOT EXISTS idx_embeddings_provider_model ON embeddings(provider, model);
 -- Combined index for efficient "chunks without embedding" queries
 CREATE INDEX IF NOT EXISTS idx_embeddings_chunk_provider_model ON embeddings(chunk_id, provider, model);
+-- Dasselbe fuer "documents without embedding" (sonst Suche nur ueber provider/model)
+CREATE INDEX IF NOT EXISTS idx_embeddings_document_provider_model ON embeddings(document_id, provider, model);
+
+-- Embedding-Cache nach Textinhalt (Re-Chunking/Retries ohne erneuten API-Call)
+CREATE TABLE IF NOT EXISTS embedding_cache (
+  provider TEXT NOT NULL,
+  model TEXT NOT NULL,
+  content_hash BLOB NOT NULL,
+  vector BLOB NOT NULL,
+  PRIMARY KEY (provider, model, content_hash)
+);
 
 -- API Usage Tracking (fuer Kosten-Dashboard)
 CREATE TABLE IF NOT EXISTS api_usage (
@@ -235,6 +267,8 @@ CREATE TABLE IF NOT EXISTS fetch_jobs (
   error TEXT
 );
 
+CREATE INDEX IF NOT EXISTS idx_fetch_jobs_started_at ON fetch_jobs(started_at);
+
 -- Fetch Failures mit Error-Klassifizierung
 CREATE TABLE IF NOT EXISTS fetch_failures (
   id INTEGER PRIMARY KEY,
@@ -271,6 +305,8 @@ CREATE TABLE IF NOT EXISTS embed_jobs (
   error TEXT
 );
 
+CREATE INDEX IF NOT EXISTS idx_embed_jobs_started_at ON embed_jobs(started_at);
+
 -- App Settings (Key-Value Store fuer Theme etc.)
 CREATE TABLE IF NOT EXISTS app_settings (
   key TEXT PRIMARY KEY,
@@ -343,6 +379,166 @@ CREATE TABLE IF NOT EXISTS prompt_templates (
 );
 """
 
+# Keep documents_fts in sync with documents (external content table).
+# Only rows with searchable content (title or fulltext) are indexed, matching
+# rebuild_fts(). The delete runs BEFORE UPDATE so the old tokens are removed
+# before the new ones are added for the same rowid.
+FTS_TRIGGERS_SQL = """
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents
+WHEN new.title IS NOT NULL OR new.fulltext IS NOT NULL
+BEGIN
+  INSERT INTO documents_fts(rowid, title, author, fulltext, summary)
+  VALUES (new.id, new.title, new.author, new.fulltext, new.summary);
+END;
+
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents
+WHEN old.title IS NOT NULL OR old.fulltext IS NOT NULL
+BEGIN
+  INSERT INTO documents_fts(documents_fts, rowid, title, author, fulltext, summary)
+  VALUES ('delete', old.id, old.title, old.author, old.fulltext, old.summary);
+END;
+
+CREATE TRIGGER IF NOT EXISTS documents_bu BEFORE UPDATE OF title, author, fulltext, summary ON documents
+WHEN old.title IS NOT NULL OR old.fulltext IS NOT NULL
+BEGIN
+  INSERT INTO documents_fts(documents_fts, rowid, title, author, fulltext, summary)
+  VALUES ('delete', old.id, old.title, old.author, old.fulltext, old.summary);
+END;
+
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE OF title, author, fulltext, summary ON documents
+WHEN new.title IS NOT NULL OR new.fulltext IS NOT NULL
+BEGIN
+  INSERT INTO documents_fts(rowid, title, author, fulltext, summary)
+  VALUES (new.id, new.title, new.author, new.fulltext, new.summary);
+END;
+"""
+
+# Tables whose row counts are maintained in the counters table
+COUNTED_TABLES = ("documents", "drafts", "highlights")
+
+# O(1) row counts for get_stats(): one counter row per table, kept current
+# by insert/delete triggers instead of COUNT(*) scans.
+COUNTER_TRIGGERS_SQL = tuple(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {t}_count_{suffix} AFTER {event} ON {t}
+    BEGIN
+      UPDATE counters SET n = n {op} 1 WHERE name = '{t}';
+    END
+    """
+    for t in COUNTED_TABLES
+    for suffix, event, op in (("ai", "INSERT", "+"), ("ad", "DELETE", "-"))
+)
+
+
+def _ensure_fts_triggers(conn: sqlite3.Connection) -> None:
+    """Create the FTS sync triggers, resyncing the index on first install.
+
+    Existing DBs may have an FTS index that drifted from documents (it was
+    only refreshed by rebuild_fts). The 'delete' command needs the exact
+    indexed values, so the index is rebuilt once before triggers take over.
+    """
+    cur = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='trigger' AND name='documents_au'"
+    )
+    if cur.fetchone() is not None:
+        return
+
+    conn.execute("INSERT INTO documents_fts(documents_fts) VALUES('delete-all')")
+    conn.execute(
+        """
+        INSERT INTO documents_fts (rowid, title, author, fulltext, summary)
+        SELECT id, title, author, fulltext, summary
+        FROM documents
+        WHERE title IS NOT NULL OR fulltext IS NOT NULL
+        """
+    )
+    conn.executescript(FTS_TRIGGERS_SQL)
+    conn.commit()
+
+
+def _quantize_vec_tables(conn: sqlite3.Connection) -> None:
+    """Convert float32 vec0 tables from older DBs to int8.
+
+    The vec0 tables are only a search index; they are rebuilt from the
+    float32 vectors kept in embeddings.
+    """
+    for dimensions in VEC_DIMENSIONS:
+        table = f"embeddings_{dimensions}"
+        cur = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,)
+        )
+        row = cur.fetchone()
+        if row is None or f"int8[{dimensions}]" in row[0]:
+            continue
+
+        logger.info(f"Quantizing {table} to int8")
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(
+            f"CREATE VIRTUAL TABLE {table} USING vec0("
+            f"embedding int8[{dimensions}], +embedding_id INTEGER)"
+        )
+        conn.execute(
+            f"""
+            INSERT INTO {table} (embedding, embedding_id)
+            SELECT {VEC_QUANTIZE.replace("?", "embedding")}, id
+            FROM embeddings WHERE dimensions = ?
+            """,
+            (dimensions,),
+        )
+        conn.commit()
+
+    # Legacy per-document table: keeps its float32 vectors in an auxiliary
+    # column, since there is no embeddings row to re-rank against
+    cur = conn.execute("SELECT sql FROM sqlite_master WHERE name='doc_embeddings'")
+    row = cur.fetchone()
+    if row is None or "int8[1536]" in row[0]:
+        return
+
+    logger.info("Quantizing doc_embeddings to int8")
+    with conn:
+        conn.execute(
+            "CREATE TEMP TABLE doc_embeddings_f32 AS SELECT document_id, embedding FROM doc_embeddings"
+        )
+        conn.execute("DROP TABLE doc_embeddings")
+        conn.execute(
+            "CREATE VIRTUAL TABLE doc_embeddings USING vec0("
+            "embedding int8[1536], document_id integer, +embedding_f32 blob)"
+        )
+        conn.execute(
+            f"""
+            INSERT INTO doc_embeddings (embedding, document_id, embedding_f32)
+            SELECT {VEC_QUANTIZE.replace("?", "embedding")}, document_id, embedding
+            FROM temp.doc_embeddings_f32
+            """
+        )
+        conn.execute("DROP TABLE temp.doc_embeddings_f32")
+
+
+def _ensure_counters(conn: sqlite3.Connection) -> None:
+    """Create the counters table and triggers, seeding from COUNT(*) once.
+
+    Seeding and trigger creation share one transaction so no insert or
+    delete can slip in between and leave a counter off by one.
+    """
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, n INTEGER NOT NULL DEFAULT 0)"
+    )
+    cur = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='trigger' AND name='highlights_count_ad'"
+    )
+    if cur.fetchone() is not None:
+        conn.commit()
+        return
+
+    with conn:
+        for table in COUNTED_TABLES:
+            conn.execute(
+                f"INSERT OR REPLACE INTO counters (name, n) SELECT '{table}', COUNT(*) FROM {table}"
+            )
+        for statement in COUNTER_TRIGGERS_SQL:
+            conn.execute(statement)
+
+
 def _backfill_document_metadata(conn: sqlite3.Connection) -> None:
     """Backfill category and word_count from raw_json for existing documents."""
     import json
@@ -476,6 +672,15 @@ def _run_migrations(conn: sqlite3.Connection) -> None:
     """)
     conn.commit()
 
+    # Partial index: only documents whose HTML fulltext is not yet cleaned
+    # (api_clean_html_fulltext). Terms must match that query's WHERE clause.
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_documents_html_fulltext ON documents(id)
+        WHERE fulltext_html IS NULL
+          AND (fulltext LIKE '<%' OR fulltext LIKE '%<p>%' OR fulltext LIKE '%<div>%')
+    """)
+    conn.commit()
+
     # Create embed_jobs table if not exists (for SSE-based embedding system)
     cur = conn.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name='embed_jobs'"
@@ -630,41 +835,256 @@ def _run_migrations(conn: sqlite3.Connection) -> None:
 
 VEC_SQL = """
 -- Legacy table (kept for backward compatibility)
+-- int8-quantisiert; der float32-Vektor liegt in der Hilfsspalte embedding_f32
 CREATE VIRTUAL TABLE IF NOT EXISTS doc_embeddings USING vec0(
-  embedding float[1536],
-  document_id integer
+  embedding int8[1536],
+  document_id integer,
+  +embedding_f32 blob
 );
 
 -- Vec0 Tabellen pro Dimension (fuer verschiedene Modelle)
+-- int8-quantisiert (siehe VEC_QUANTIZE); die float32-Vektoren liegen in embeddings
 -- 768: Ollama nomic-embed-text
 CREATE VIRTUAL TABLE IF NOT EXISTS embeddings_768 USING vec0(
-  embedding float[768],
+  embedding int8[768],
   +embedding_id INTEGER
 );
 
 -- 1024: Ollama mxbai-embed-large
 CREATE VIRTUAL TABLE IF NOT EXISTS embeddings_1024 USING vec0(
-  embedding float[1024],
+  embedding int8[1024],
   +embedding_id INTEGER
 );
 
 -- 1536: OpenAI text-embedding-3-small
 CREATE VIRTUAL TABLE IF NOT EXISTS embeddings_1536 USING vec0(
-  embedding float[1536],
+  embedding int8[1536],
   +embedding_id INTEGER
 );
 
 -- 3072: OpenAI text-embedding-3-large
 CREATE VIRTUAL TABLE IF NOT EXISTS embeddings_3072 USING vec0(
-  embedding float[3072],
+  embedding int8[3072],
   +embedding_id INTEGER
 );
 """
 
+# Dimensions with a per-dimension vec0 KNN table (embeddings_<dim>)
+VEC_DIMENSIONS = (768, 1024, 1536, 3072)
+
+# The vec0 tables hold int8 copies of the float32 vectors in embeddings:
+# 4x less data to scan per KNN query. Vectors are L2-normalized first so
+# every component fits the 'unit' [-1, 1] range (OpenAI vectors already are;
+# Ollama vectors would otherwise overflow).
+VEC_QUANTIZE = "vec_quantize_int8(vec_normalize(?), 'unit')"
+
+# The int8 scan returns this many times k candidates, which are then
+# re-ranked by exact float32 L2 distance (see DB.knn_search).
+KNN_OVERSAMPLE = 4
+
+
+# Hot-path statements, hoisted so the sqlite3 statement cache
+# (cached_statements in init_db) reuses the prepared plan on every call.
+SEARCH_DOCUMENTS_FTS_SQL = """
+SELECT d.id, d.title, d.author, d.url_original AS url, d.saved_at
+FROM documents_fts f
+JOIN documents d ON d.id = f.rowid
+WHERE documents_fts MATCH ?
+ORDER BY rank
+LIMIT ?
+"""
+
+UPDATE_ARTICLE_WITH_FULLTEXT_SQL = """
+UPDATE documents SET
+    provider_id = ?,
+    url_original = COALESCE(?, url_original),
+    url_canonical = ?,
+    title = COALESCE(?, title),
+    author = COALESCE(?, author),
+    published_at = COALESCE(?, published_at),
+    saved_at = COALESCE(?, saved_at),
+    category = COALESCE(?, category),
+    word_count = COALESCE(?, word_count),
+    fulltext = ?,
+    fulltext_html = COALESCE(?, fulltext_html),
+    fulltext_source = ?,
+    fulltext_fetched_at = ?,
+    summary = COALESCE(?, summary),
+    raw_json = COALESCE(?, raw_json),
+    updated_at = ?
+WHERE id = ?
+"""
+
+UPDATE_ARTICLE_SQL = """
+UPDATE documents SET
+    provider_id = ?,
+    url_original = COALESCE(?, url_original),
+    url_canonical = ?,
+    title = COALESCE(?, title),
+    author = COALESCE(?, author),
+    published_at = COALESCE(?, published_at),
+    saved_at = COALESCE(?, saved_at),
+    category = COALESCE(?, category),
+    word_count = COALESCE(?, word_count),
+    fulltext_html = COALESCE(?, fulltext_html),
+    summary = COALESCE(?, summary),
+    raw_json = COALESCE(?, raw_json),
+    updated_at = ?
+WHERE id = ?
+"""
+
+UPSERT_ARTICLE_SQL = """
+INSERT INTO documents (
+    source, provider_id, url_original, url_canonical, title, author,
+    published_at, saved_at, category, word_count,
+    fulltext, fulltext_html, fulltext_source, fulltext_fetched_at, summary, raw_json,
+    created_at, updated_at
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(source, provider_id) DO UPDATE SET
+    url_original = COALESCE(excluded.url_original, url_original),
+    url_canonical = COALESCE(excluded.url_canonical, url_canonical),
+    title = COALESCE(excluded.title, title),
+    author = COALESCE(excluded.author, author),
+    published_at = COALESCE(excluded.published_at, published_at),
+    saved_at = COALESCE(excluded.saved_at, saved_at),
+    category = COALESCE(excluded.category, category),
+    word_count = COALESCE(excluded.word_count, word_count),
+    fulltext = COALESCE(excluded.fulltext, fulltext),
+    fulltext_html = COALESCE(excluded.fulltext_html, fulltext_html),
+    fulltext_source = CASE WHEN excluded.fulltext IS NOT NULL THEN excluded.fulltext_source ELSE fulltext_source END,
+    fulltext_fetched_at = CASE WHEN excluded.fulltext IS NOT NULL THEN excluded.fulltext_fetched_at ELSE fulltext_fetched_at END,
+    summary = COALESCE(excluded.summary, summary),
+    raw_json = COALESCE(excluded.raw_json, raw_json),
+    updated_at = excluded.updated_at
+RETURNING id
+"""
+
+UPSERT_HIGHLIGHTS_SQL = """
+INSERT INTO highlights (document_id, text_hash, provider_highlight_id, text, note, highlighted_at, provider)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(document_id, text_hash) DO UPDATE SET
+    provider_highlight_id = COALESCE(excluded.provider_highlight_id, provider_highlight_id),
+    text = excluded.text,
+    note = COALESCE(excluded.note, note),
+    highlighted_at = COALESCE(excluded.highlighted_at, highlighted_at),
+    provider = COALESCE(excluded.provider, provider)
+"""
+
+# executemany() can't return rows, so only the single-row upsert has RETURNING
+UPSERT_HIGHLIGHT_SQL = UPSERT_HIGHLIGHTS_SQL + "RETURNING id\n"
+
+SELECT_HIGHLIGHTS_FOR_DOCUMENT_SQL = """
+SELECT id, text, note, highlighted_at, provider
+FROM highlights
+WHERE document_id = ?
+ORDER BY highlighted_at DESC, id DESC
+"""
+
+
+# Max read-only connections kept by ConnectionPool
+READ_POOL_SIZE = 4
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Seconds a writer waits for the lock (e.g. behind the background FTS
+# optimize after a sync) before failing with "database is locked"
+WRITE_BUSY_TIMEOUT = 120.0
+
+# Memory-map up to 256 MiB of the DB file; reads skip the read() copy
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+class ConnectionPool:
+    """Read-only SQLite connections for concurrent readers. Thread-safe.
+
+    WAL mode lets readers run in parallel with each other and with the
+    single writer connection. Connections are opened lazily up to
+    max_readers; further callers wait for one to be released.
+    """
+
+    def __init__(self, db_path: str, max_readers: int = READ_POOL_SIZE) -> None:
+        self._db_path = db_path
+        self._max_readers = max_readers
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._all: list[sqlite3.Connection] = []
+        # Readers that have sqlite-vec loaded (done on first vector query)
+        self._vec_loaded: set[sqlite3.Connection] = set()
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"file:{self._db_path}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self._max_readers:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        return self._idle.get()
+
+    @contextmanager
+    def connection(self, vec: bool = False) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection for the duration of the block.
+
+        Pass vec=True to query vec0 tables; sqlite-vec is then loaded into
+        the borrowed connection if it isn't already.
+        """
+        conn = self._acquire()
+        try:
+            if vec and conn not in self._vec_loaded:
+                sqlite_vec.load(conn)
+                self._vec_loaded.add(conn)
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+            self._vec_loaded.clear()
+
 
 @dataclass
 class DB:
     conn: sqlite3.Connection
+    pool: ConnectionPool | None = None
+
+    @contextmanager
+    def reader(self, vec: bool = False) -> Iterator[sqlite3.Connection]:
+        """Connection for read-only queries (pooled if available).
+
+        Readers only see committed data. Without a pool (tests, in-memory
+        DBs) this is the writer connection. Pass vec=True for queries
+        against vec0 tables.
+        """
+        if self.pool is None:
+            yield self.conn
+            return
+        with self.pool.connection(vec=vec) as conn:
+            yield conn
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """The single read-write connection."""
+        yield self.conn
 
     def init(self) -> None:
         self.conn.executescript(SCHEMA_SQL)
@@ -672,6 +1092,7 @@ class DB:
         self.conn.commit()
         # Run migrations for existing DBs
         _run_migrations(self.conn)
+        _quantize_vec_tables(self.conn)
 
         # Validate and auto-repair FTS if corrupted (SQLite version mismatch)
         fts_status = self.validate_and_repair_fts()
@@ -680,14 +1101,16 @@ class DB:
         elif not fts_status["valid"]:
             logger.error(f"FTS validation failed: {fts_status['error']}")
 
+        if fts_status["valid"]:
+            _ensure_fts_triggers(self.conn)
+
+        _ensure_counters(self.conn)
+
     def get_stats(self) -> dict[str, Any]:
-        cur = self.conn.execute("select count(*) from documents")
-        docs = cur.fetchone()[0]
-        cur = self.conn.execute("select count(*) from drafts")
-        drafts = cur.fetchone()[0]
-        cur = self.conn.execute("select count(*) from highlights")
-        highlights = cur.fetchone()[0]
-        return {"documents": docs, "drafts": drafts, "highlights": highlights}
+        """Row counts from the trigger-maintained counters table."""
+        with self.reader() as conn:
+            counts = dict(conn.execute("SELECT name, n FROM counters").fetchall())
+        return {t: counts.get(t, 0) for t in COUNTED_TABLES}
 
     def get_library_stats(self) -> dict[str, Any]:
         """Get stats for the library page."""
@@ -716,39 +1139,27 @@ class DB:
 
     def search_documents(self, q: str, limit: int = 50) -> list[dict[str, Any]]:
         q = (q or "").strip()
-        if not q:
-            cur = self.conn.execute(
-                "SELECT id, title, author, url_original, saved_at FROM documents ORDER BY id DESC LIMIT ?",
-                (limit,),
-            )
-        else:
-            try:
-                cur = self.conn.execute(
-                    """
-                    SELECT d.id, d.title, d.author, d.url_original, d.saved_at
-                    FROM documents_fts f
-                    JOIN documents d ON d.id = f.rowid
-                    WHERE documents_fts MATCH ?
-                    ORDER BY rank
-                    LIMIT ?
-                    """,
-                    (q, limit),
+        with self.reader() as conn:
+            if not q:
+                cur = conn.execute(
+                    "SELECT id, title, author, url_original AS url, saved_at FROM documents ORDER BY id DESC LIMIT ?",
+                    (limit,),
                 )
-            except sqlite3.DatabaseError as e:
-                logger.warning(f"FTS search failed, using LIKE fallback: {e}")
-                return self._search_like_fallback(q, limit)
-        rows = []
-        for r in cur.fetchall():
-            rows.append(
-                {
-                    "id": r[0],
-                    "title": r[1],
-                    "author": r[2],
-                    "url": r[3],
-                    "saved_at": r[4],
-                }
-            )
-        return rows
+            else:
+                try:
+                    cur = conn.execute(
+                        SEARCH_DOCUMENTS_FTS_SQL,
+                        (q, limit),
+                    )
+                except sqlite3.DatabaseError as e:
+                    logger.warning(f"FTS search failed, using LIKE fallback: {e}")
+                    cur = None
+            if cur is not None:
+                # Columns are aliased to the result keys; rows are converted
+                # straight off the cursor without an intermediate fetchall() list
+                return list(map(dict, cur))
+        # Fallback outside the reader block so it doesn't hold two pool slots
+        return self._search_like_fallback(q, limit)
 
     def get_document(self, doc_id: int) -> dict[str, Any] | None:
         """Get a single document by ID with all metadata."""
@@ -785,22 +1196,23 @@ class DB:
 
     def list_digests(self) -> list[dict[str, Any]]:
         """List all saved digests/queries."""
-        cur = self.conn.execute(
-            "SELECT id, name, query, mode, created_at FROM digests ORDER BY id DESC"
-        )
-        return [
-            {"id": r[0], "name": r[1], "query": r[2], "mode": r[3] or "fts", "created_at": r[4]}
-            for r in cur.fetchall()
-        ]
+        with self.reader() as conn:
+            cur = conn.execute(
+                "SELECT id, name, query, COALESCE(mode, 'fts') AS mode, created_at "
+                "FROM digests ORDER BY id DESC"
+            )
+            return list(map(dict, cur))
 
     def create_digest(self, name: str, query: str, mode: str = "fts") -> int:
-        """Create a new digest/saved query. Returns the new ID."""
+        """Create a new digest/saved query. Returns the new ID.
+
+        Does not commit; wrap the call in ``with db.conn:``.
+        """
         cur = self.conn.execute(
             "INSERT INTO digests(name, query, mode) VALUES(?, ?, ?) RETURNING id",
             (name.strip(), query.strip(), mode),
         )
         digest_id = cur.fetchone()[0]
-        self.conn.commit()
         return digest_id
 
     def get_digest(self, digest_id: int) -> dict[str, Any] | None:
@@ -1005,6 +1417,41 @@ class DB:
             })
         return rows
 
+    def knn_search(
+        self, query_embedding: bytes, dimensions: int, k: int
+    ) -> list[tuple[int, float]]:
+        """Nearest embeddings as (embedding_id, distance), closest first.
+
+        Two stages: a coarse KNN over the int8 vec0 table fetches
+        k * KNN_OVERSAMPLE candidates, which are re-ranked by exact float32
+        L2 distance against embeddings.embedding. Distances therefore match
+        the previous float32 vec0 tables.
+        """
+        cur = self.conn.execute(
+            f"""
+            SELECT embedding_id
+            FROM embeddings_{dimensions}
+            WHERE embedding MATCH {VEC_QUANTIZE} AND k = ?
+            """,
+            (query_embedding, k * KNN_OVERSAMPLE),
+        )
+        candidate_ids = [r[0] for r in cur.fetchall()]
+        if not candidate_ids:
+            return []
+
+        placeholders = ",".join("?" * len(candidate_ids))
+        cur = self.conn.execute(
+            f"""
+            SELECT id, vec_distance_l2(embedding, ?) AS distance
+            FROM embeddings
+            WHERE id IN ({placeholders})
+            ORDER BY distance
+            LIMIT ?
+            """,
+            (query_embedding, *candidate_ids, k),
+        )
+        return [(r[0], r[1]) for r in cur.fetchall()]
+
     def search_library_semantic(
         self,
         query_embedding: bytes,
@@ -1039,43 +1486,41 @@ class DB:
         if not search_fulltext:
             return []  # No fulltext docs requested, nothing to search
 
-        vec_table = f"embeddings_{dimensions}"
-
         # Step 1: Get KNN results from vector table
         # Fetch more chunks to ensure we get enough unique documents
         try:
-            cur = self.conn.execute(
-                f"""
-                SELECT embedding_id, distance
-                FROM {vec_table}
-                WHERE embedding MATCH ? AND k = ?
-                """,
-                (query_embedding, limit * 5),  # Get 5x to account for grouping
-            )
-            knn_results = cur.fetchall()
+            # Get 5x to account for grouping
+            knn_results = self.knn_search(query_embedding, dimensions, limit * 5)
         except Exception:
             return []
 
-        # Step 2: Group by document_id - keep best (lowest distance) chunk per document
+        if not knn_results:
+            return []
+
+        # Step 2: Chunk + document details for all hits in one query
+        placeholders = ",".join("?" * len(knn_results))
+        cur = self.conn.execute(
+            f"""
+            SELECT e.id, e.chunk_id, c.chunk_text, c.char_start, c.char_end,
+                   c.chunk_index, c.document_id,
+                   d.title, d.author, d.url_original,
+                   COALESCE(d.saved_at, (SELECT MIN(highlighted_at) FROM highlights h WHERE h.document_id = d.id)) as effective_date,
+                   d.category, d.word_count,
+                   (SELECT COUNT(*) FROM highlights h WHERE h.document_id = d.id) as highlight_count
+            FROM embeddings e
+            JOIN document_chunks c ON c.id = e.chunk_id
+            JOIN documents d ON d.id = c.document_id
+            WHERE e.id IN ({placeholders})
+            """,
+            [embedding_id for embedding_id, _ in knn_results],
+        )
+        rows = {r[0]: r[1:] for r in cur.fetchall()}
+
+        # Step 3: Group by document_id - keep best (lowest distance) chunk per document
         seen_docs: dict[int, dict[str, Any]] = {}
 
         for embedding_id, distance in knn_results:
-            cur = self.conn.execute(
-                """
-                SELECT e.chunk_id, c.chunk_text, c.char_start, c.char_end,
-                       c.chunk_index, c.document_id,
-                       d.title, d.author, d.url_original,
-                       COALESCE(d.saved_at, (SELECT MIN(highlighted_at) FROM highlights h WHERE h.document_id = d.id)) as effective_date,
-                       d.category, d.word_count,
-                       (SELECT COUNT(*) FROM highlights h WHERE h.document_id = d.id) as highlight_count
-                FROM embeddings e
-                JOIN document_chunks c ON c.id = e.chunk_id
-                JOIN documents d ON d.id = c.document_id
-                WHERE e.id = ?
-                """,
-                (embedding_id,),
-            )
-            row = cur.fetchone()
+            row = rows.get(embedding_id)
             if not row:
                 continue
 
@@ -1164,11 +1609,9 @@ class DB:
         if conditions:
             sql += " WHERE " + " AND ".join(conditions)
         sql += " ORDER BY updated_at DESC"
-        cur = self.conn.execute(sql, params)
-        return [
-            {"id": r[0], "status": r[1], "kind": r[2], "title": r[3], "created_at": r[4], "updated_at": r[5]}
-            for r in cur.fetchall()
-        ]
+        with self.reader() as conn:
+            cur = conn.execute(sql, params)
+            return list(map(dict, cur))
 
     def create_draft(self, kind: str, title: str | None = None, text: str = "", note: str | None = None) -> int:
         """Create a new draft with its first version. Returns the draft id."""
@@ -1265,6 +1708,7 @@ class DB:
         fulltext_source: str | None = None,
         summary: str | None = None,
         raw_json: str | None = None,
+        now: str | None = None,
     ) -> int:
         """Save or update an article in the documents table.
 
@@ -1280,9 +1724,15 @@ class DB:
             fulltext: Clean text for search/chunking/embedding
             fulltext_html: Original HTML from source (preserved for rich display)
             fulltext_source: Source of fulltext ('readwise', 'trafilatura', 'manual')
+            now: Timestamp for created_at/updated_at (see sql_now()); pass one
+                value per batch when importing many articles
+
+        Does not commit; wrap the call (or a batch of calls) in
+        ``with db.conn:``.
 
         Returns the document id (existing or new).
         """
+        now = now or sql_now()
         url_canonical = normalize_url(url_original)
 
         # Normalize category (plural->singular, LinkedIn URL detection)
@@ -1304,98 +1754,39 @@ class DB:
             # Only update fulltext_source and fulltext_fetched_at if new fulltext is provided
             if fulltext:
                 self.conn.execute(
-                    """
-                    UPDATE documents SET
-                        provider_id = ?,
-                        url_original = COALESCE(?, url_original),
-                        url_canonical = ?,
-                        title = COALESCE(?, title),
-                        author = COALESCE(?, author),
-                        published_at = COALESCE(?, published_at),
-                        saved_at = COALESCE(?, saved_at),
-                        category = COALESCE(?, category),
-                        word_count = COALESCE(?, word_count),
-                        fulltext = ?,
-                        fulltext_html = COALESCE(?, fulltext_html),
-                        fulltext_source = ?,
-                        fulltext_fetched_at = datetime('now'),
-                        summary = COALESCE(?, summary),
-                        raw_json = COALESCE(?, raw_json),
-                        updated_at = datetime('now')
-                    WHERE id = ?
-                    """,
+                    UPDATE_ARTICLE_WITH_FULLTEXT_SQL,
                     (provider_id, url_original, url_canonical, title, author,
-                     published_at, saved_at, category, word_count, fulltext, fulltext_html, fulltext_source, summary, raw_json, existing_id),
+                     published_at, saved_at, category, word_count, fulltext, fulltext_html, fulltext_source, now,
+                     summary, raw_json, now, existing_id),
                 )
             else:
                 self.conn.execute(
-                    """
-                    UPDATE documents SET
-                        provider_id = ?,
-                        url_original = COALESCE(?, url_original),
-                        url_canonical = ?,
-                        title = COALESCE(?, title),
-                        author = COALESCE(?, author),
-                        published_at = COALESCE(?, published_at),
-                        saved_at = COALESCE(?, saved_at),
-                        category = COALESCE(?, category),
-                        word_count = COALESCE(?, word_count),
-                        fulltext_html = COALESCE(?, fulltext_html),
-                        summary = COALESCE(?, summary),
-                        raw_json = COALESCE(?, raw_json),
-                        updated_at = datetime('now')
-                    WHERE id = ?
-                    """,
+                    UPDATE_ARTICLE_SQL,
                     (provider_id, url_original, url_canonical, title, author,
-                     published_at, saved_at, category, word_count, fulltext_html, summary, raw_json, existing_id),
+                     published_at, saved_at, category, word_count, fulltext_html, summary, raw_json, now, existing_id),
                 )
-            self.conn.commit()
             return existing_id
 
         # 3. No URL match - UPSERT by provider_id (fallback for docs without URL)
         # Set fulltext_fetched_at only if fulltext is provided
-        fulltext_fetched_at = "datetime('now')" if fulltext else None
+        fulltext_fetched_at = now if fulltext is not None else None
         cur = self.conn.execute(
-            """
-            INSERT INTO documents (
-                source, provider_id, url_original, url_canonical, title, author,
-                published_at, saved_at, category, word_count,
-                fulltext, fulltext_html, fulltext_source, fulltext_fetched_at, summary, raw_json
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CASE WHEN ? IS NOT NULL THEN datetime('now') END, ?, ?)
-            ON CONFLICT(source, provider_id) DO UPDATE SET
-                url_original = COALESCE(excluded.url_original, url_original),
-                url_canonical = COALESCE(excluded.url_canonical, url_canonical),
-                title = COALESCE(excluded.title, title),
-                author = COALESCE(excluded.author, author),
-                published_at = COALESCE(excluded.published_at, published_at),
-                saved_at = COALESCE(excluded.saved_at, saved_at),
-                category = COALESCE(excluded.category, category),
-                word_count = COALESCE(excluded.word_count, word_count),
-                fulltext = COALESCE(excluded.fulltext, fulltext),
-                fulltext_html = COALESCE(excluded.fulltext_html, fulltext_html),
-                fulltext_source = CASE WHEN excluded.fulltext IS NOT NULL THEN excluded.fulltext_source ELSE fulltext_source END,
-                fulltext_fetched_at = CASE WHEN excluded.fulltext IS NOT NULL THEN datetime('now') ELSE fulltext_fetched_at END,
-                summary = COALESCE(excluded.summary, summary),
-                raw_json = COALESCE(excluded.raw_json, raw_json),
-                updated_at = datetime('now')
-            RETURNING id
-            """,
+            UPSERT_ARTICLE_SQL,
             (source, provider_id, url_original, url_canonical, title, author,
              published_at, saved_at, category, word_count,
-             fulltext, fulltext_html, fulltext_source, fulltext, summary, raw_json),
+             fulltext, fulltext_html, fulltext_source, fulltext_fetched_at, summary, raw_json,
+             now, now),
         )
         row = cur.fetchone()
-        self.conn.commit()
         doc_id = row[0] if row else 0
-        # FTS index will be rebuilt after import via rebuild_fts()
+        # FTS index is kept in sync by the documents_* triggers
         return doc_id
 
     def rebuild_fts(self) -> int:
         """Rebuild the entire FTS index from the documents table.
 
-        This is more efficient than updating row-by-row and avoids
-        conflicts with sqlite-vec during bulk imports.
+        The documents_* triggers keep the index current on every write;
+        this is only needed to repair drift or compact the index.
 
         Only indexes documents that have actual searchable content
         (title or fulltext) to avoid orphaned FTS entries.
@@ -1403,7 +1794,7 @@ class DB:
         Returns the number of documents indexed.
         """
         # Clear and rebuild the FTS index - only documents with content
-        self.conn.execute("DELETE FROM documents_fts")
+        self.conn.execute("INSERT INTO documents_fts(documents_fts) VALUES('delete-all')")
         self.conn.execute(
             """
             INSERT INTO documents_fts (rowid, title, author, fulltext, summary)
@@ -1419,6 +1810,29 @@ class DB:
         cur = self.conn.execute("SELECT COUNT(*) FROM documents_fts")
         return cur.fetchone()[0]
 
+    def optimize_fts(self) -> None:
+        """Merge FTS segments and refresh query planner stats.
+
+        Can take seconds on a large index, so run it in the background after
+        imports rather than inline. Uses its own connection so the long write
+        transaction doesn't mix with statements on the shared writer, which
+        waits for it (WRITE_BUSY_TIMEOUT). No-op for in-memory DBs.
+        """
+        db_path = self.conn.execute("PRAGMA database_list").fetchone()[2]
+        if not db_path:
+            return
+        conn = sqlite3.connect(db_path, timeout=WRITE_BUSY_TIMEOUT)
+        try:
+            with conn:
+                conn.execute("INSERT INTO documents_fts(documents_fts) VALUES('optimize')")
+            conn.execute("PRAGMA optimize")
+        finally:
+            conn.close()
+
+    def count_fts_documents(self) -> int:
+        """Number of documents in the FTS index."""
+        return self.conn.execute("SELECT COUNT(*) FROM documents_fts_docsize").fetchone()[0]
+
     def _rebuild_fts_safe(self) -> int:
         """Rebuild FTS with DROP + CREATE (handles SQLite version mismatch).
 
@@ -1479,20 +1893,18 @@ class DB:
     ) -> list[dict[str, Any]]:
         """Fallback search using LIKE when FTS is unavailable."""
         pattern = f"%{q}%"
-        cur = self.conn.execute(
-            """
-            SELECT id, title, author, url_original, saved_at
-            FROM documents
-            WHERE title LIKE ? OR fulltext LIKE ?
-            ORDER BY saved_at DESC NULLS LAST
-            LIMIT ?
-            """,
-            (pattern, pattern, limit),
-        )
-        return [
-            {"id": r[0], "title": r[1], "author": r[2], "url": r[3], "saved_at": r[4]}
-            for r in cur.fetchall()
-        ]
+        with self.reader() as conn:
+            cur = conn.execute(
+                """
+                SELECT id, title, author, url_original AS url, saved_at
+                FROM documents
+                WHERE title LIKE ? OR fulltext LIKE ?
+                ORDER BY saved_at DESC NULLS LAST
+                LIMIT ?
+                """,
+                (pattern, pattern, limit),
+            )
+            return list(map(dict, cur))
 
     def save_highlight(
         self,
@@ -1512,49 +1924,51 @@ class DB:
         This prevents duplicate highlights when the same content is imported
         multiple times with different provider_highlight_ids.
 
+        Does not commit; wrap the call (or a batch of calls) in
+        ``with db.conn:``.
+
         Returns the highlight id (existing or new).
         """
         th = text_hash(text)
 
         cur = self.conn.execute(
-            """
-            INSERT INTO highlights (document_id, text_hash, provider_highlight_id, text, note, highlighted_at, provider)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(document_id, text_hash) DO UPDATE SET
-                provider_highlight_id = COALESCE(excluded.provider_highlight_id, provider_highlight_id),
-                text = excluded.text,
-                note = COALESCE(excluded.note, note),
-                highlighted_at = COALESCE(excluded.highlighted_at, highlighted_at),
-                provider = COALESCE(excluded.provider, provider)
-            RETURNING id
-            """,
+            UPSERT_HIGHLIGHT_SQL,
             (document_id, th, provider_highlight_id, text, note, highlighted_at, provider),
         )
         row = cur.fetchone()
-        self.conn.commit()
         return row[0] if row else 0
 
+    def save_highlights(self, document_id: int, highlights: list[dict[str, Any]]) -> None:
+        """Upsert several highlights of one document with a single executemany.
+
+        Each dict has provider_highlight_id and text, optionally note,
+        highlighted_at and provider. Same dedup and commit rules as
+        save_highlight().
+        """
+        self.conn.executemany(
+            UPSERT_HIGHLIGHTS_SQL,
+            [
+                (
+                    document_id,
+                    text_hash(hl["text"]),
+                    hl["provider_highlight_id"],
+                    hl["text"],
+                    hl.get("note"),
+                    hl.get("highlighted_at"),
+                    hl.get("provider"),
+                )
+                for hl in highlights
+            ],
+        )
+
     def get_highlights_for_document(self, document_id: int) -> list[dict[str, Any]]:
         """Get all highlights for a document."""
-        cur = self.conn.execute(
-            """
-            SELECT id, text, note, highlighted_at, provider
-            FROM highlights
-            WHERE document_id = ?
-            ORDER BY highlighted_at DESC, id DESC
-            """,
-            (document_id,),
-        )
-        return [
-            {
-                "id": r[0],
-                "text": r[1],
-                "note": r[2],
-                "highlighted_at": r[3],
-                "provider": r[4],
-            }
-            for r in cur.fetchall()
-        ]
+        with self.reader() as conn:
+            cur = conn.execute(
+                SELECT_HIGHLIGHTS_FOR_DOCUMENT_SQL,
+                (document_id,),
+            )
+            return list(map(dict, cur))
 
     def get_documents_without_embedding(self, limit: int = 100) -> list[dict[str, Any]]:
         """Get documents that don't have embeddings yet.
@@ -1602,8 +2016,9 @@ class DB:
             (document_id,),
         )
         self.conn.execute(
-            "INSERT INTO doc_embeddings (embedding, document_id) VALUES (?, ?)",
-            (embedding, document_id),
+            f"INSERT INTO doc_embeddings (embedding, document_id, embedding_f32) "
+            f"VALUES ({VEC_QUANTIZE}, ?, ?)",
+            (embedding, document_id, embedding),
         )
         self.conn.commit()
 
@@ -1631,16 +2046,22 @@ class DB:
         Returns:
             List of documents with id, title, author, url, saved_at, and distance
         """
-        # sqlite-vec requires k=? syntax for KNN queries
+        # Coarse int8 KNN (sqlite-vec requires k=?), then exact float32
+        # re-rank of the candidates, as in knn_search()
         cur = self.conn.execute(
-            """
-            SELECT e.document_id, e.distance, d.title, d.author, d.url_original, d.saved_at
-            FROM doc_embeddings e
+            f"""
+            SELECT e.document_id, vec_distance_l2(e.embedding_f32, ?) AS distance,
+                   d.title, d.author, d.url_original, d.saved_at
+            FROM (
+                SELECT document_id, embedding_f32
+                FROM doc_embeddings
+                WHERE embedding MATCH {VEC_QUANTIZE} AND k = ?
+            ) e
             JOIN documents d ON d.id = e.document_id
-            WHERE e.embedding MATCH ? AND k = ?
-            ORDER BY e.distance
+            ORDER BY distance
+            LIMIT ?
             """,
-            (query_embedding, limit),
+            (query_embedding, query_embedding, limit * KNN_OVERSAMPLE, limit),
         )
         results = []
         for row in cur.fetchall():
@@ -1661,7 +2082,7 @@ class DB:
     def save_chunks(
         self, document_id: int, chunks: list[dict[str, Any]]
     ) -> list[int]:
-        """Save chunks for a document.
+        """Save chunks for a document. Caller commits (use ``with db.conn:``).
 
         Args:
             document_id: The document ID
@@ -1681,14 +2102,25 @@ class DB:
             (document_id,),
         )
 
-        chunk_ids = []
-        for chunk in chunks:
-            cur = self.conn.execute(
-                """
-                INSERT INTO document_chunks (document_id, chunk_index, chunk_text, char_start, char_end, token_count)
-                VALUES (?, ?, ?, ?, ?, ?)
-                RETURNING id
-                """,
+        self.insert_chunks((document_id, chunk) for chunk in chunks)
+        cur = self.conn.execute(
+            "SELECT id FROM document_chunks WHERE document_id = ? ORDER BY chunk_index",
+            (document_id,),
+        )
+        return [row[0] for row in cur]
+
+    def insert_chunks(self, chunks: Iterable[tuple[int, dict[str, Any]]]) -> None:
+        """Insert (document_id, chunk dict) pairs in one executemany.
+
+        Unlike save_chunks() this neither deletes old chunks nor returns ids.
+        Caller commits.
+        """
+        self.conn.executemany(
+            """
+            INSERT INTO document_chunks (document_id, chunk_index, chunk_text, char_start, char_end, token_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
                 (
                     document_id,
                     chunk["chunk_index"],
@@ -1696,12 +2128,10 @@ class DB:
                     chunk["char_start"],
                     chunk["char_end"],
                     chunk.get("token_count"),
-                ),
-            )
-            chunk_ids.append(cur.fetchone()[0])
-
-        self.conn.commit()
-        return chunk_ids
+                )
+                for document_id, chunk in chunks
+            ),
+        )
 
     def get_chunks_for_document(self, document_id: int) -> list[dict[str, Any]]:
         """Get all chunks for a document."""
@@ -1787,6 +2217,25 @@ class DB:
 
         return chunk
 
+    def _add_neighbour_context(self, results: list[dict[str, Any]]) -> None:
+        """Set context_before/context_after (the adjacent chunk) on each result."""
+        keys = [
+            (r["id"], r["chunk_index"] + offset) for r in results for offset in (-1, 1)
+        ]
+        values = ",".join("(?, ?)" for _ in keys)
+        cur = self.conn.execute(
+            f"""
+            SELECT document_id, chunk_index, chunk_text
+            FROM document_chunks
+            WHERE (document_id, chunk_index) IN (VALUES {values})
+            """,
+            [v for key in keys for v in key],
+        )
+        texts = {(r[0], r[1]): r[2] for r in cur.fetchall()}
+        for r in results:
+            r["context_before"] = texts.get((r["id"], r["chunk_index"] - 1), "")
+            r["context_after"] = texts.get((r["id"], r["chunk_index"] + 1), "")
+
     # ==================== New Embeddings Methods ====================
 
     def save_embedding_v2(
@@ -1829,7 +2278,7 @@ class DB:
         # Insert into vec0 table for KNN search
         vec_table = f"embeddings_{dimensions}"
         self.conn.execute(
-            f"INSERT INTO {vec_table} (embedding, embedding_id) VALUES (?, ?)",
+            f"INSERT INTO {vec_table} (embedding, embedding_id) VALUES ({VEC_QUANTIZE}, ?)",
             (embedding, embedding_id),
         )
 
@@ -1885,7 +2334,7 @@ class DB:
             embedding_id = cur.lastrowid
 
             self.conn.execute(
-                f"INSERT INTO {vec_table} (embedding, embedding_id) VALUES (?, ?)",
+                f"INSERT INTO {vec_table} (embedding, embedding_id) VALUES ({VEC_QUANTIZE}, ?)",
                 (embedding, embedding_id),
             )
             count += 1
@@ -1894,6 +2343,30 @@ class DB:
         self.conn.commit()
         return count
 
+    def get_cached_embeddings(
+        self, provider: str, model: str, hashes: list[bytes]
+    ) -> dict[bytes, bytes]:
+        """Look up cached vectors by content hash (see embedding_content_hash)."""
+        if not hashes:
+            return {}
+        placeholders = ",".join("?" * len(hashes))
+        rows = self.conn.execute(
+            f"""
+            SELECT content_hash, vector FROM embedding_cache
+            WHERE provider = ? AND model = ? AND content_hash IN ({placeholders})
+            """,
+            (provider, model, *hashes),
+        ).fetchall()
+        return {bytes(row[0]): row[1] for row in rows}
+
+    def cache_embeddings(self, provider: str, model: str, vectors: dict[bytes, bytes]) -> None:
+        """Store content hash -> vector."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO embedding_cache (provider, model, content_hash, vector) VALUES (?, ?, ?, ?)",
+                [(provider, model, h, v) for h, v in vectors.items()],
+            )
+
     def semantic_search_v2(
         self,
         query_embedding: bytes,
@@ -1916,84 +2389,71 @@ class DB:
         Returns:
             List of results with distance and metadata
         """
-        vec_table = f"embeddings_{dimensions}"
+        knn_results = self.knn_search(query_embedding, dimensions, limit)
+        if not knn_results:
+            return []
+        distances = dict(knn_results)
+        placeholders = ",".join("?" * len(distances))
+        params: list[Any] = list(distances)
 
         if search_chunks:
             # Search in chunks
             query = f"""
-                SELECT v.embedding_id, v.distance,
-                       e.chunk_id, c.chunk_text, c.char_start, c.char_end, c.document_id,
+                SELECT e.id, e.chunk_id, c.chunk_text, c.char_start, c.char_end, c.document_id,
                        d.title, d.author, d.url_original
-                FROM {vec_table} v
-                JOIN embeddings e ON e.id = v.embedding_id
+                FROM embeddings e
                 JOIN document_chunks c ON c.id = e.chunk_id
                 JOIN documents d ON d.id = c.document_id
-                WHERE v.embedding MATCH ? AND k = ?
+                WHERE e.id IN ({placeholders})
                   AND e.chunk_id IS NOT NULL
             """
-            params: list[Any] = [query_embedding, limit]
-
-            if provider:
-                query += " AND e.provider = ?"
-                params.append(provider)
-            if model:
-                query += " AND e.model = ?"
-                params.append(model)
-
-            query += " ORDER BY v.distance"
-            cur = self.conn.execute(query, params)
-
-            results = []
-            for row in cur.fetchall():
-                results.append({
-                    "embedding_id": row[0],
-                    "distance": row[1],
-                    "chunk_id": row[2],
-                    "chunk_text": row[3],
-                    "char_start": row[4],
-                    "char_end": row[5],
-                    "document_id": row[6],
-                    "title": row[7],
-                    "author": row[8],
-                    "url": row[9],
-                })
-            return results
-
         else:
             # Search in documents
             query = f"""
-                SELECT v.embedding_id, v.distance,
-                       e.document_id, d.title, d.author, d.url_original, d.saved_at
-                FROM {vec_table} v
-                JOIN embeddings e ON e.id = v.embedding_id
+                SELECT e.id, e.document_id, d.title, d.author, d.url_original, d.saved_at
+                FROM embeddings e
                 JOIN documents d ON d.id = e.document_id
-                WHERE v.embedding MATCH ? AND k = ?
+                WHERE e.id IN ({placeholders})
                   AND e.document_id IS NOT NULL
             """
-            params = [query_embedding, limit]
 
-            if provider:
-                query += " AND e.provider = ?"
-                params.append(provider)
-            if model:
-                query += " AND e.model = ?"
-                params.append(model)
+        if provider:
+            query += " AND e.provider = ?"
+            params.append(provider)
+        if model:
+            query += " AND e.model = ?"
+            params.append(model)
 
-            query += " ORDER BY v.distance"
-            cur = self.conn.execute(query, params)
+        rows = sorted(self.conn.execute(query, params).fetchall(), key=lambda r: distances[r[0]])
 
-            results = []
-            for row in cur.fetchall():
-                results.append({
+        if search_chunks:
+            return [
+                {
                     "embedding_id": row[0],
-                    "distance": row[1],
-                    "id": row[2],
-                    "title": row[3],
-                    "author": row[4],
-                    "url": row[5],
-                    "saved_at": row[6],
-                })
-            return results
+                    "distance": distances[row[0]],
+                    "chunk_id": row[1],
+                    "chunk_text": row[2],
+                    "char_start": row[3],
+                    "char_end": row[4],
+                    "document_id": row[5],
+                    "title": row[6],
+                    "author": row[7],
+                    "url": row[8],
+                }
+                for row in rows
+            ]
+        return [
+            {
+                "embedding_id": row[0],
+                "distance": distances[row[0]],
+                "id": row[1],
+                "title": row[2],
+                "author": row[3],
+                "url": row[4],
+                "saved_at": row[5],
+            }
+            for row in rows
+        ]
 
     def get_documents_without_embedding_v2(
         self, provider: str, model: str, limit: int = 100
@@ -2089,7 +2549,7 @@ class DB:
 
         # Delete from vec tables first (foreign key style)
         vec_deleted = 0
-        for dimensions in [768, 1024, 1536, 3072]:
+        for dimensions in VEC_DIMENSIONS:
             table = f"embeddings_{dimensions}"
             try:
                 # Delete in batches to avoid huge IN clauses
@@ -2288,39 +2748,35 @@ class DB:
             return self.semantic_search(query_embedding, limit)
 
         # Search in chunk embeddings
-        vec_table = f"embeddings_{dimensions}"
-
         try:
             # sqlite-vec KNN queries don't allow JOINs in the same query
             # Step 1: Get nearest neighbors (embedding_id, distance)
+            knn_results = self.knn_search(query_embedding, dimensions, limit)
+
+            if not knn_results:
+                return []
+
+            # Step 2: Get details for all results in one query
+            placeholders = ",".join("?" * len(knn_results))
             cur = self.conn.execute(
                 f"""
-                SELECT embedding_id, distance
-                FROM {vec_table}
-                WHERE embedding MATCH ? AND k = ?
+                SELECT e.id, e.chunk_id, c.chunk_text, c.char_start, c.char_end,
+                       c.chunk_index, c.document_id,
+                       d.title, d.author, d.url_original, d.saved_at
+                FROM embeddings e
+                JOIN document_chunks c ON c.id = e.chunk_id
+                JOIN documents d ON d.id = c.document_id
+                WHERE e.id IN ({placeholders})
                 """,
-                (query_embedding, limit),
+                [embedding_id for embedding_id, _ in knn_results],
             )
-            knn_results = cur.fetchall()
+            rows = {r[0]: r[1:] for r in cur.fetchall()}
 
-            # Step 2: Get details for each result
             results = []
             for embedding_id, distance in knn_results:
-                cur = self.conn.execute(
-                    """
-                    SELECT e.chunk_id, c.chunk_text, c.char_start, c.char_end,
-                           c.chunk_index, c.document_id,
-                           d.title, d.author, d.url_original, d.saved_at
-                    FROM embeddings e
-                    JOIN document_chunks c ON c.id = e.chunk_id
-                    JOIN documents d ON d.id = c.document_id
-                    WHERE e.id = ?
-                    """,
-                    (embedding_id,),
-                )
-                row = cur.fetchone()
+                row = rows.get(embedding_id)
                 if row:
-                    result = {
+                    results.append({
                         "id": row[5],  # document_id
                         "distance": distance,
                         "chunk_id": row[0],
@@ -2332,15 +2788,11 @@ class DB:
                         "author": row[7],
                         "url": row[8],
                         "saved_at": row[9],
-                    }
-
-                    # Get context if requested
-                    if include_context:
-                        context = self.get_chunk_context(row[0], context_chunks=1)
-                        result["context_before"] = context.get("context_before", "")
-                        result["context_after"] = context.get("context_after", "")
+                    })
 
-                    results.append(result)
+            # Neighbouring chunks for all results in one query
+            if include_context and results:
+                self._add_neighbour_context(results)
 
             return results
 
@@ -2611,19 +3063,18 @@ class DB:
         row = cur.fetchone()
         return row[0] if row else default
 
-    def set_setting(self, key: str, value: str) -> None:
-        """Set a setting value (upsert)."""
+    def set_setting(self, key: str, value: str, now: str | None = None) -> None:
+        """Set a setting value (upsert). Does not commit."""
         self.conn.execute(
             """
             INSERT INTO app_settings (key, value, updated_at)
-            VALUES (?, ?, datetime('now'))
+            VALUES (?, ?, ?)
             ON CONFLICT(key) DO UPDATE SET
                 value = excluded.value,
-                updated_at = datetime('now')
+                updated_at = excluded.updated_at
             """,
-            (key, value)
+            (key, value, now or sql_now())
         )
-        self.conn.commit()
 
     def get_theme(self) -> dict[str, str]:
         """Get theme settings with defaults."""
@@ -2737,14 +3188,15 @@ class DB:
         fontSize: str | None = None
     ) -> None:
         """Update theme settings. Only updates provided values."""
-        if primary is not None:
-            self.set_setting("theme_primary", primary)
-        if spacing is not None:
-            self.set_setting("theme_spacing", spacing)
-        if radius is not None:
-            self.set_setting("theme_radius", radius)
-        if fontSize is not None:
-            self.set_setting("theme_font_size", fontSize)
+        with self.conn:
+            if primary is not None:
+                self.set_setting("theme_primary", primary)
+            if spacing is not None:
+                self.set_setting("theme_spacing", spacing)
+            if radius is not None:
+                self.set_setting("theme_radius", radius)
+            if fontSize is not None:
+                self.set_setting("theme_font_size", fontSize)
 
     # ==================== LLM Config Methods ====================
 
@@ -3249,9 +3701,22 @@ def init_db() -> None:
     s = Settings.from_env()
     os.makedirs(os.path.dirname(s.db_path), exist_ok=True)
 
-    conn = sqlite3.connect(s.db_path, check_same_thread=False)
+    conn = sqlite3.connect(
+        s.db_path,
+        timeout=WRITE_BUSY_TIMEOUT,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
     conn.row_factory = sqlite3.Row
 
+    # WAL + NORMAL: fsync only at checkpoints, not on every commit
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # 64 MiB page cache (negative value = KiB) for the writer
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    # Sorter/temp b-trees (ORDER BY, GROUP BY, DISTINCT) stay in RAM
+    conn.execute("PRAGMA temp_store=MEMORY")
+
     # sqlite-vec must be loaded into this connection
     sqlite_vec.load(conn)
 
@@ -3263,6 +3728,9 @@ def init_db() -> None:
     _db = DB(conn=conn)
     _db.init()
 
+    # Readers are opened read-only, so the schema must exist first
+    _db.pool = ConnectionPool(s.db_path)
+
     # Initialize job stores with same connection
     init_import_store(conn)
     init_fetch_store(conn)
@@ -1,16 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 
 import markdown2
 
 from fastapi import FastAPI, Form, HTTPException, Request
-from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    ORJSONResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from starlette.datastructures import Headers, QueryParams
+from starlette.middleware.gzip import GZipResponder
+from starlette.staticfiles import NotModifiedResponse
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
 from app.core.settings import Settings
+from app.core.sse import ORJSON_AVAILABLE, batch_sse, sse_message
 from app.core.storage import get_db, init_db
 from app.core.import_job import ImportStatus, get_import_store
 from app.core.fetch_job import (
@@ -25,9 +44,15 @@ from app.core.pipeline_job import (
     run_pipeline,
 )
 from app.core.content_fetcher import extract_text_from_html
+from app.core.query_cache import (
+    clear_search_cache,
+    get_query_embedding_cached,
+    search_documents_cached,
+    semantic_search_cached,
+)
 from app.core.embed_job import generate_embeddings_batch, generate_embeddings_v2, generate_chunk_embeddings_v2
-from app.core.chunking import get_chunking_info, chunk_document
-from app.core.embeddings import get_embedding, serialize_f32
+from app.core.chunking import chunk_documents, get_chunking_info, map_in_pool, shutdown_chunk_pool
+from app.core.embeddings import serialize_f32
 from app.core.embedding_providers import (
     get_provider,
     get_all_models,
@@ -35,15 +60,40 @@ from app.core.embedding_providers import (
     OllamaProvider,
     EmbeddingError,
 )
-from app.providers.readwise import ImportEventType, ReadwiseAuthError, ReadwiseClient
+from app.providers.readwise import (
+    ImportEventType,
+    ReadwiseAuthError,
+    ReadwiseClient,
+    close_readwise_clients,
+)
+
+logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent
 TEMPLATES_DIR = BASE_DIR / "templates"
 STATIC_DIR = BASE_DIR / "static"
 
+SETTINGS = Settings.from_env()
+
+_AUTOESCAPE_EXTENSIONS = frozenset(("html", "xml"))
+STREAM_CHUNK_BYTES = 16 * 1024
+
+
+def _autoescape(template_name: str | None) -> bool:
+    """Autoescape .html/.xml and string templates (same rule as select_autoescape)."""
+    if template_name is None:
+        return True
+    return template_name.rpartition(".")[2].lower() in _AUTOESCAPE_EXTENSIONS
+
+
+# Outside dev, templates are compiled once per process (no stat() per render)
+# and the compiled bytecode survives restarts in the user's temp dir.
 jinja = Environment(
     loader=FileSystemLoader(str(TEMPLATES_DIR)),
-    autoescape=select_autoescape(["html", "xml"]),
+    autoescape=_autoescape,
+    auto_reload=SETTINGS.app_env == "dev",
+    cache_size=400,
+    bytecode_cache=FileSystemBytecodeCache(),
 )
 
 
@@ -72,24 +122,205 @@ def _render_markdown(text: str) -> str:
 
 jinja.filters["markdown"] = _render_markdown
 
-app = FastAPI(title="nexus-os")
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with browser caching.
+
+    Assets linked with a version query (``/static/app.css?v=4``) are cached
+    for a year and never revalidated; bump ``v`` to bust the cache. Everything
+    else is cached for an hour, then revalidated via the ETag/Last-Modified
+    headers Starlette already sends (answered with 304).
+
+    After preload(), files up to PRELOAD_MAX_BYTES are served from memory
+    without a stat()/open() per request.
+    """
+
+    PRELOAD_MAX_BYTES = 1024 * 1024
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._preloaded: dict[str, tuple[bytes, list[tuple[bytes, bytes]]]] = {}
+
+    def preload(self) -> None:
+        """Read small assets and their FileResponse headers into memory."""
+        root = Path(self.directory)
+        for full_path in root.rglob("*"):
+            stat_result = full_path.stat()
+            if not full_path.is_file() or stat_result.st_size > self.PRELOAD_MAX_BYTES:
+                continue
+            # Same headers Starlette would send, minus Range support
+            headers = [
+                (k, v)
+                for k, v in FileResponse(full_path, stat_result=stat_result).raw_headers
+                if k != b"accept-ranges"
+            ]
+            self._preloaded[full_path.relative_to(root).as_posix()] = (full_path.read_bytes(), headers)
+
+    async def get_response(self, path, scope):
+        cached = self._preloaded.get(path) if scope["method"] in ("GET", "HEAD") else None
+        if cached is None:
+            return await super().get_response(path, scope)
+        body, raw_headers = cached
+        response = Response(body)
+        response.raw_headers = list(raw_headers)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            response = NotModifiedResponse(response.headers)
+        return self._cache_control(response, scope)
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        return self._cache_control(response, scope)
+
+    @staticmethod
+    def _cache_control(response: Response, scope) -> Response:
+        if "v" in QueryParams(scope.get("query_string", b"")):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "public, max-age=3600"
+        return response
+
+
+class _PageGZipResponder(GZipResponder):
+    async def send_with_gzip(self, message):
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith("text/event-stream"):
+                # Treated like an already-encoded body: passed through as-is
+                self.content_encoding_set = True
+
 
+class PageGZipMiddleware(GZipMiddleware):
+    """GZip responses, except SSE streams.
 
-@app.on_event("startup")
-def _startup() -> None:
+    GZip buffers streamed bodies, so events would be held back until the
+    compressor flushes. Decided on the response Content-Type, so it holds
+    for any client, not only EventSource's Accept: text/event-stream.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("accept-encoding", ""):
+            responder = _PageGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     init_db()
+    if not jinja.auto_reload:
+        _precompile_templates()
+        static_files.preload()
+    yield
+    close_readwise_clients()
+    shutdown_chunk_pool()
+
+
+# Returning an instance directly skips FastAPI's jsonable_encoder pass,
+# used for job status payloads that are already plain JSON types.
+JSONResponseClass = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
+app = FastAPI(
+    title="nexus-os",
+    lifespan=lifespan,
+    default_response_class=JSONResponseClass,
+)
+app.add_middleware(PageGZipMiddleware, minimum_size=1024, compresslevel=5)
+static_files = CachedStaticFiles(directory=str(STATIC_DIR))
+app.mount("/static", static_files, name="static")
+
+
+@lru_cache(maxsize=64)
+def _get_template(template_name: str):
+    """Compiled template by name, skipping Jinja's loader lookup."""
+    return jinja.get_template(template_name)
+
+
+@lru_cache(maxsize=16)
+def _render_static(template_name: str) -> bytes:
+    return _get_template(template_name).render().encode("utf-8")
+
+
+def _precompile_templates() -> None:
+    """Compile every template at startup instead of on its first request."""
+    for path in TEMPLATES_DIR.rglob("*.html"):
+        _get_template(path.relative_to(TEMPLATES_DIR).as_posix())
+
+
+def _template(template_name: str):
+    # With auto_reload (dev) Jinja must see every call to pick up edits
+    if jinja.auto_reload:
+        return jinja.get_template(template_name)
+    return _get_template(template_name)
 
 
 def render(template_name: str, **ctx) -> HTMLResponse:
-    template = jinja.get_template(template_name)
-    return HTMLResponse(template.render(**ctx))
+    template = _template(template_name)
+    # Pass bytes so the response doesn't encode the str again
+    body = template.render(**ctx).encode("utf-8")
+    request = ctx.get("request")
+    if request is None or request.method != "GET":
+        return HTMLResponse(body)
+    return _with_etag(request, body)
+
+
+def _with_etag(request: Request, body: bytes) -> Response:
+    """Tag a page with a content hash; answer 304 if the client already has it."""
+    etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    # no-cache = may store, but must revalidate with the ETag on every use
+    return HTMLResponse(body, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def render_stream(template_name: str, **ctx) -> StreamingResponse:
+    """Render a large page chunk by chunk instead of buffering it whole.
+
+    No ETag: the body isn't known until it has been sent.
+    """
+    return StreamingResponse(_stream_template(template_name, ctx), media_type="text/html")
+
+
+async def _stream_template(template_name: str, ctx: dict) -> AsyncIterator[bytes]:
+    # Async so Starlette doesn't hop to the threadpool for every tiny Jinja
+    # chunk; pieces are batched into STREAM_CHUNK_BYTES sends instead.
+    buffer: list[str] = []
+    size = 0
+    for chunk in _template(template_name).generate(**ctx):
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= STREAM_CHUNK_BYTES:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def render_static(template_name: str) -> HTMLResponse:
+    """Render a page that uses no per-request context.
+
+    Outside dev the encoded page is rendered once and served from memory.
+    """
+    if jinja.auto_reload:
+        return render(template_name)
+    return HTMLResponse(_render_static(template_name))
+
+
+# Final job states (a FAILED fetch job can still be resumed)
+FETCH_FINISHED = frozenset({FetchStatus.COMPLETED, FetchStatus.CANCELLED})
+PIPELINE_FINISHED = frozenset({PipelineStatus.COMPLETED, PipelineStatus.CANCELLED, PipelineStatus.FAILED})
+
+
+def _job_status_response(job, finished: bool) -> Response:
+    """Job status JSON; a finished job never changes, so clients may cache it."""
+    cache_control = "private, max-age=3600, immutable" if finished else "no-store"
+    return JSONResponseClass(job.to_dict(), headers={"Cache-Control": cache_control})
 
 
 @app.get("/", response_class=HTMLResponse)
-def home(request: Request):
-    s = Settings.from_env()
-    return render("home.html", request=request, settings=s)
+async def home(request: Request):
+    return render_static("home.html")
 
 
 @app.get("/library", response_class=HTMLResponse)
@@ -127,8 +358,7 @@ async def library(
 
     if mode == "semantic" and q_stripped:
         try:
-            query_embedding = await get_embedding(q_stripped)
-            embedding_bytes = serialize_f32(query_embedding)
+            embedding_bytes = await get_query_embedding_cached(q_stripped)
             rows = db.search_library_semantic(
                 query_embedding=embedding_bytes,
                 dimensions=1536,
@@ -203,8 +433,7 @@ async def library_results(
 
     if mode == "semantic" and q_stripped:
         try:
-            query_embedding = await get_embedding(q_stripped)
-            embedding_bytes = serialize_f32(query_embedding)
+            embedding_bytes = await get_query_embedding_cached(q_stripped)
             rows = db.search_library_semantic(
                 query_embedding=embedding_bytes,
                 dimensions=1536,
@@ -256,11 +485,12 @@ def document_detail(request: Request, doc_id: int):
     if not doc:
         return render("document_detail.html", request=request, doc=None, highlights=[], error="Dokument nicht gefunden")
     highlights = db.get_highlights_for_document(doc_id)
-    return render("document_detail.html", request=request, doc=doc, highlights=highlights, error=None)
+    # Full text is rendered twice (markdown + raw JSON) and can run to megabytes
+    return render_stream("document_detail.html", request=request, doc=doc, highlights=highlights, error=None)
 
 
 @app.get("/digests")
-def digests_redirect():
+async def digests_redirect():
     """Redirect old /digests to /digest."""
     return RedirectResponse(url="/digest", status_code=302)
 
@@ -282,7 +512,8 @@ def digest_queries_create(
 ):
     """Create a new saved query."""
     db = get_db()
-    db.create_digest(name=name, query=query, mode=mode)
+    with db.conn:
+        db.create_digest(name=name, query=query, mode=mode)
     return RedirectResponse(url="/digest/queries", status_code=303)
 
 
@@ -318,15 +549,14 @@ async def api_digest_results(digest_id: int, limit: int = 10):
     if digest["mode"] == "semantic":
         # Generate embedding and search
         try:
-            query_embedding = await get_embedding(digest["query"])
-            embedding_bytes = serialize_f32(query_embedding)
+            embedding_bytes = await get_query_embedding_cached(digest["query"])
             results = db.semantic_search_with_chunks(
                 embedding_bytes, dimensions=1536, limit=limit, include_context=False
             )
         except Exception:
-            results = db.search_documents(digest["query"], limit=limit)
+            results = search_documents_cached(db, digest["query"], limit=limit)
     else:
-        results = db.search_documents(digest["query"], limit=limit)
+        results = search_documents_cached(db, digest["query"], limit=limit)
 
     # Render results as HTML fragment
     html = '<div class="digest-results-list">'
@@ -362,17 +592,16 @@ async def api_digest_count(digest_id: int):
 
     if digest["mode"] == "semantic":
         try:
-            query_embedding = await get_embedding(digest["query"])
-            embedding_bytes = serialize_f32(query_embedding)
+            embedding_bytes = await get_query_embedding_cached(digest["query"])
             results = db.semantic_search_with_chunks(
                 embedding_bytes, dimensions=1536, limit=100, include_context=False
             )
             return HTMLResponse(str(len(results)))
         except Exception:
-            results = db.search_documents(digest["query"], limit=100)
+            results = search_documents_cached(db, digest["query"], limit=100)
             return HTMLResponse(str(len(results)))
     else:
-        results = db.search_documents(digest["query"], limit=100)
+        results = search_documents_cached(db, digest["query"], limit=100)
         return HTMLResponse(str(len(results)))
 
 
@@ -395,7 +624,7 @@ def drafts_list(request: Request, status: str | None = None, kind: str | None =
 
 
 @app.get("/drafts/new", response_class=HTMLResponse)
-def draft_new(request: Request):
+async def draft_new(request: Request):
     """Show form to create a new draft."""
     kinds = ["linkedin", "article", "note"]
     return render("draft_new.html", request=request, kinds=kinds)
@@ -450,17 +679,34 @@ def draft_update_title(request: Request, draft_id: int, title: str = Form(...)):
 
 @app.get("/admin", response_class=HTMLResponse)
 def admin(request: Request):
-    s = Settings.from_env()
     db = get_db()
     stats = db.get_stats()
     embedding_stats = db.get_embedding_stats_v2()  # Use v2 for chunk-based stats
-    return render("admin.html", request=request, settings=s, stats=stats, embedding_stats=embedding_stats)
+    return render("admin.html", request=request, settings=SETTINGS, stats=stats, embedding_stats=embedding_stats)
 
 
 @app.get("/admin/compare", response_class=HTMLResponse)
-def admin_compare(request: Request):
+async def admin_compare(request: Request):
     """Model comparison page for side-by-side embedding provider testing."""
-    return render("admin_compare.html", request=request)
+    return render_static("admin_compare.html")
+
+
+# Strong refs to fire-and-forget tasks; the loop only keeps weak ones
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _log_usage_in_background(db, **usage) -> None:
+    """db.log_api_usage() on a worker thread; failures are only logged."""
+
+    def log() -> None:
+        try:
+            db.log_api_usage(**usage)
+        except Exception as e:
+            logger.warning(f"Failed to log usage: {e}")
+
+    task = asyncio.create_task(asyncio.to_thread(log))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
 
 @app.get("/api/compare/search")
@@ -513,21 +759,17 @@ async def api_compare_search(q: str, provider: str = "openai", limit: int = 5):
             "query": q,
         }
 
-        # Track usage (non-critical, wrapped in try/except)
-        try:
-            db.log_api_usage(
-                provider=embed_provider.name.lower(),
-                model=embed_provider.model_id,
-                operation="compare_search",
-                tokens_input=token_estimate,
-                cost_usd=cost_usd,
-                latency_ms=total_latency,
-                success=True,
-            )
-        except Exception as log_err:
-            # Don't fail the search if logging fails
-            import logging
-            logging.warning(f"Failed to log usage: {log_err}")
+        # Track usage (non-critical) without holding up the response
+        _log_usage_in_background(
+            db,
+            provider=embed_provider.name.lower(),
+            model=embed_provider.model_id,
+            operation="compare_search",
+            tokens_input=token_estimate,
+            cost_usd=cost_usd,
+            latency_ms=total_latency,
+            success=True,
+        )
 
         return response
 
@@ -583,6 +825,7 @@ def admin_fts_rebuild():
     """
     db = get_db()
     count = db.rebuild_fts()
+    clear_search_cache()
     return {"indexed": count, "message": f"FTS Index rebuilt with {count} documents"}
 
 
@@ -607,68 +850,47 @@ def admin_embeddings_cleanup_orphans():
     }
 
 
-@app.get("/api/providers/health")
-async def api_providers_health():
-    """Check health of all embedding providers.
-
-    Returns status for both OpenAI and Ollama providers.
-    Useful for admin UI to show which providers are available.
-    """
-    results = []
-
-    # Check OpenAI
+async def _provider_health(provider_cls, name: str, model: str) -> dict:
+    """Health check result for one provider; construction errors count as unhealthy."""
     try:
-        openai_provider = OpenAIProvider()
-        openai_health = await openai_provider.health_check()
-        results.append({
-            "provider": openai_health.provider,
-            "model": openai_health.model,
-            "healthy": openai_health.healthy,
-            "message": openai_health.message,
-            "latency_ms": openai_health.latency_ms,
-            "details": openai_health.details,
-        })
+        health = await provider_cls().health_check()
+        return {
+            "provider": health.provider,
+            "model": health.model,
+            "healthy": health.healthy,
+            "message": health.message,
+            "latency_ms": health.latency_ms,
+            "details": health.details,
+        }
     except Exception as e:
-        results.append({
-            "provider": "OpenAI",
-            "model": "text-embedding-3-small",
+        return {
+            "provider": name,
+            "model": model,
             "healthy": False,
             "message": str(e),
-        })
+        }
 
-    # Check Ollama
-    try:
-        ollama_provider = OllamaProvider()
-        ollama_health = await ollama_provider.health_check()
-        results.append({
-            "provider": ollama_health.provider,
-            "model": ollama_health.model,
-            "healthy": ollama_health.healthy,
-            "message": ollama_health.message,
-            "latency_ms": ollama_health.latency_ms,
-            "details": ollama_health.details,
-        })
-    except Exception as e:
-        results.append({
-            "provider": "Ollama",
-            "model": "nomic-embed-text",
-            "healthy": False,
-            "message": str(e),
-        })
 
-    return {"providers": results}
+@app.get("/api/providers/health")
+async def api_providers_health():
+    """Check health of all embedding providers.
 
+    Returns status for both OpenAI and Ollama providers.
+    Useful for admin UI to show which providers are available.
+    Both checks run concurrently.
+    """
+    results = await asyncio.gather(
+        _provider_health(OpenAIProvider, "OpenAI", "text-embedding-3-small"),
+        _provider_health(OllamaProvider, "Ollama", "nomic-embed-text"),
+    )
+    return {"providers": list(results)}
 
-@app.get("/api/providers/models")
-def api_providers_models():
-    """Get all available embedding models grouped by provider.
 
-    Returns model details including dimensions, costs, and descriptions.
-    """
-    all_models = get_all_models()
+@lru_cache(maxsize=1)
+def _models_json() -> bytes:
+    """The static model catalogue, encoded once."""
     result = {}
-
-    for provider_name, models in all_models.items():
+    for provider_name, models in get_all_models().items():
         result[provider_name] = [
             {
                 "model_id": info.model_id,
@@ -679,8 +901,16 @@ def api_providers_models():
             }
             for info in models.values()
         ]
+    return json.dumps({"models": result}).encode("utf-8")
 
-    return {"models": result}
+
+@app.get("/api/providers/models")
+async def api_providers_models():
+    """Get all available embedding models grouped by provider.
+
+    Returns model details including dimensions, costs, and descriptions.
+    """
+    return Response(_models_json(), media_type="application/json")
 
 
 @app.get("/api/providers/{provider}/health")
@@ -703,9 +933,9 @@ async def api_provider_health(provider: str, model: str | None = None):
             "details": health.details,
         }
     except ValueError as e:
-        return {"error": str(e)}, 400
+        return JSONResponse({"error": str(e)}, status_code=400)
     except Exception as e:
-        return {"error": str(e)}, 500
+        return JSONResponse({"error": str(e)}, status_code=500)
 
 
 # ==================== V2 Embedding Endpoints ====================
@@ -794,11 +1024,10 @@ async def api_generate_embeddings_fast(
     from app.core.embeddings import serialize_f32
 
     db = get_db()
-    settings = Settings.from_env()
     start_time = time.monotonic()
 
     # Get provider
-    provider = OpenAIProvider(model=settings.embedding_model or "text-embedding-3-small")
+    provider = OpenAIProvider(model=SETTINGS.embedding_model or "text-embedding-3-small")
 
     # Get chunks without embeddings
     cur = db.conn.execute(
@@ -823,25 +1052,25 @@ async def api_generate_embeddings_fast(
             "message": "Keine ausstehenden Chunks",
         }
 
+    # Longest first: each request then holds texts of similar length, so no
+    # batch waits on one outlier (ids are permuted the same way)
+    chunks = sorted(chunks, key=lambda row: len(row[1]), reverse=True)
     chunk_ids = [row[0] for row in chunks]
-    texts = [row[1][:20000] if len(row[1]) > 20000 else row[1] for row in chunks]  # Truncate
+    texts = [row[1][:20000] for row in chunks]  # Truncate
+    total_tokens = sum(map(len, texts)) // 4
 
     # Generate embeddings in parallel
     processed = 0
     failed = 0
 
     try:
-        embeddings = await provider.embed_parallel(
+        # Save each API batch as soon as it arrives (one transaction per batch)
+        async for start, batch_embeddings in provider.embed_parallel_stream(
             texts,
             batch_size=batch_size,
             max_concurrent=max_concurrent,
-        )
-
-        # Save embeddings in batches to avoid long transactions
-        SAVE_BATCH = 500
-        for i in range(0, len(embeddings), SAVE_BATCH):
-            batch_embeddings = embeddings[i : i + SAVE_BATCH]
-            batch_ids = chunk_ids[i : i + SAVE_BATCH]
+        ):
+            batch_ids = chunk_ids[start : start + len(batch_embeddings)]
 
             embeddings_data = []
             for chunk_id, emb in zip(batch_ids, batch_embeddings):
@@ -872,8 +1101,11 @@ async def api_generate_embeddings_fast(
             "duration_seconds": round(time.monotonic() - start_time, 1),
         }
 
+    finally:
+        if processed:
+            clear_search_cache()
+
     # Calculate cost
-    total_tokens = sum(len(t) // 4 for t in texts)
     cost_usd = provider.estimate_cost(total_tokens)
     duration = round(time.monotonic() - start_time, 1)
 
@@ -908,51 +1140,59 @@ def api_generate_chunks_only(limit: int = 500):
     """
     db = get_db()
 
+    # One anti-join scan: the window counts all unchunked documents before
+    # LIMIT, and only the ids are buffered (fulltext is joined afterwards)
     cur = db.conn.execute(
         """
-        SELECT d.id, d.title, d.fulltext
-        FROM documents d
-        LEFT JOIN document_chunks c ON c.document_id = d.id
-        WHERE c.id IS NULL AND d.fulltext IS NOT NULL AND d.fulltext != ''
-        LIMIT ?
+        SELECT d.id, d.title, d.fulltext, u.total
+        FROM (
+            SELECT d.id, COUNT(*) OVER () AS total
+            FROM documents d
+            LEFT JOIN document_chunks c ON c.document_id = d.id
+            WHERE c.id IS NULL AND d.fulltext IS NOT NULL AND d.fulltext != ''
+            LIMIT ?
+        ) u
+        JOIN documents d ON d.id = u.id
         """,
         (limit,),
     )
     docs_to_chunk = cur.fetchall()
+    unchunked_total = docs_to_chunk[0][3] if docs_to_chunk else 0
+
+    # Chunk before opening the write transaction; the documents have no
+    # chunks yet, so one executemany insert covers the whole batch
+    docs = [(doc_id, fulltext, title or "") for doc_id, title, fulltext, _ in docs_to_chunk if fulltext]
+    chunked = chunk_documents([(fulltext, title) for _, fulltext, title in docs])
+    new_chunks = [
+        (doc_id, chunk)
+        for (doc_id, _, _), chunks in zip(docs, chunked)
+        for chunk in chunks
+    ]
+    with db.conn:
+        db.insert_chunks(new_chunks)
+    if new_chunks:
+        clear_search_cache()
 
-    chunks_created = 0
-    documents_processed = 0
-
-    for doc_id, title, fulltext in docs_to_chunk:
-        if not fulltext:
-            continue
-        chunks = chunk_document(fulltext, title or "")
-        if chunks:
-            db.save_chunks(doc_id, [c.to_dict() for c in chunks])
-            chunks_created += len(chunks)
-            documents_processed += 1
-
-    # Get remaining count
-    remaining = db.conn.execute(
-        """
-        SELECT COUNT(*)
-        FROM documents d
-        LEFT JOIN document_chunks c ON c.document_id = d.id
-        WHERE c.id IS NULL AND d.fulltext IS NOT NULL AND d.fulltext != ''
-        """
-    ).fetchone()[0]
+    chunks_created = len(new_chunks)
+    documents_processed = sum(1 for chunks in chunked if chunks)
 
     return {
         "chunks_created": chunks_created,
         "documents_processed": documents_processed,
-        "remaining_documents": remaining,
+        # Documents that yielded no chunks stay unchunked
+        "remaining_documents": unchunked_total - documents_processed,
     }
 
 
+@lru_cache(maxsize=1)
+def _chunking_info_json() -> bytes:
+    return json.dumps(get_chunking_info()).encode("utf-8")
+
+
 @app.get("/api/chunking/info")
-def api_chunking_info():
-    """Get information about chunking parameters."""
-    return get_chunking_info()
+async def api_chunking_info():
+    """Get information about chunking parameters (static, encoded once)."""
+    return Response(_chunking_info_json(), media_type="application/json")
 
 
 @app.get("/api/chunking/unchunked")
@@ -1039,43 +1279,58 @@ def api_clean_html_fulltext(limit: int = 100, rechunk: bool = True):
     )
     docs = cur.fetchall()
 
-    cleaned = 0
     skipped = 0
     failed = 0
     chunks_deleted = 0
-    chunks_created = 0
+    # Extract and chunk first (CPU only, in worker processes for large
+    # batches), then write everything in one transaction
+    updates: list[tuple[str, str, int]] = []
+    titles: list[str] = []
 
+    pending = []
     for doc_id, title, fulltext, fulltext_html in docs:
         if not fulltext or not fulltext.strip():
             skipped += 1
-            continue
+        else:
+            pending.append((doc_id, title, fulltext))
 
-        clean_text = extract_text_from_html(fulltext)
+    extracted = map_in_pool(extract_text_from_html, [fulltext for _, _, fulltext in pending])
+    for (doc_id, title, fulltext), clean_text in zip(pending, extracted):
         if clean_text:
             # Save original HTML to fulltext_html before cleaning fulltext
-            db.conn.execute(
+            updates.append((fulltext, clean_text, doc_id))
+            titles.append(title or "")
+        else:
+            failed += 1
+
+    new_chunks: list[tuple[int, dict]] = []
+    if rechunk:
+        chunked = chunk_documents([(clean_text, title) for (_, clean_text, _), title in zip(updates, titles)])
+        new_chunks = [
+            (doc_id, chunk)
+            for (_, _, doc_id), chunks in zip(updates, chunked)
+            for chunk in chunks
+        ]
+
+    if updates:
+        with db.conn:
+            db.conn.executemany(
                 "UPDATE documents SET fulltext_html = ?, fulltext = ? WHERE id = ?",
-                (fulltext, clean_text, doc_id),
+                updates,
             )
-            cleaned += 1
-
             if rechunk:
                 # Delete existing chunks (and their embeddings via cascade)
-                deleted = db.conn.execute(
-                    "DELETE FROM document_chunks WHERE document_id = ?",
-                    (doc_id,),
+                doc_ids = [doc_id for _, _, doc_id in updates]
+                placeholders = ",".join("?" * len(doc_ids))
+                chunks_deleted = db.conn.execute(
+                    f"DELETE FROM document_chunks WHERE document_id IN ({placeholders})",
+                    doc_ids,
                 ).rowcount
-                chunks_deleted += deleted
+                db.insert_chunks(new_chunks)
+        clear_search_cache()
 
-                # Create new chunks from clean text
-                chunks = chunk_document(clean_text, title or "")
-                if chunks:
-                    db.save_chunks(doc_id, [c.to_dict() for c in chunks])
-                    chunks_created += len(chunks)
-        else:
-            failed += 1
-
-    db.conn.commit()
+    cleaned = len(updates)
+    chunks_created = len(new_chunks)
 
     # Count remaining HTML documents (not yet migrated)
     remaining = db.conn.execute(
@@ -1190,7 +1445,7 @@ def api_get_prompt(key: str):
     prompt = get_prompt(key, db)
 
     if prompt is None:
-        return {"error": f"Prompt '{key}' not found"}, 404
+        return JSONResponse({"error": f"Prompt '{key}' not found"}, status_code=404)
 
     # Also get default for comparison
     default = get_default_prompt(key)
@@ -1222,7 +1477,7 @@ def api_update_prompt(
     from app.core.prompts import save_prompt, DEFAULT_PROMPTS
 
     if key not in DEFAULT_PROMPTS:
-        return {"error": f"Prompt '{key}' not found"}, 404
+        return JSONResponse({"error": f"Prompt '{key}' not found"}, status_code=404)
 
     db = get_db()
     save_prompt(key, template, temperature, max_tokens, db)
@@ -1236,7 +1491,7 @@ def api_reset_prompt(key: str):
     from app.core.prompts import reset_prompt, DEFAULT_PROMPTS
 
     if key not in DEFAULT_PROMPTS:
-        return {"error": f"Prompt '{key}' not found"}, 404
+        return JSONResponse({"error": f"Prompt '{key}' not found"}, status_code=404)
 
     db = get_db()
     was_custom = reset_prompt(key, db)
@@ -1270,13 +1525,7 @@ async def api_semantic_search(q: str, limit: int = 10):
         return {"results": [], "error": "Query is required"}
 
     try:
-        # Get embedding for query
-        query_embedding = await get_embedding(q.strip())
-        embedding_bytes = serialize_f32(query_embedding)
-
-        # Search
-        db = get_db()
-        results = db.semantic_search(embedding_bytes, limit=limit)
+        results = await semantic_search_cached(get_db(), q, limit=limit)
 
         return {"results": results, "query": q}
     except Exception as e:
@@ -1310,9 +1559,9 @@ def admin_fetch(request: Request):
 
 
 @app.get("/admin/prompts", response_class=HTMLResponse)
-def admin_prompts(request: Request):
+async def admin_prompts(request: Request):
     """Prompt template management page."""
-    return render("admin_prompts.html", request=request)
+    return render_static("admin_prompts.html")
 
 
 @app.post("/api/fetch/start")
@@ -1391,7 +1640,7 @@ def api_fetch_status(job_id: str):
     if not job:
         return {"error": "Job not found"}
 
-    return job.to_dict()
+    return _job_status_response(job, job.status in FETCH_FINISHED)
 
 
 @app.get("/api/fetch/{job_id}/stream")
@@ -1417,11 +1666,10 @@ async def api_fetch_stream(job_id: str):
             async for event in run_fetch_job(job, db, store):
                 yield event.to_sse()
         except Exception as e:
-            import json
-            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+            yield sse_message("error", {"error": str(e)})
 
     return StreamingResponse(
-        event_generator(),
+        batch_sse(event_generator()),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -1479,20 +1727,18 @@ def api_fetch_jobs(limit: int = 10):
     store = get_fetch_store()
     jobs = store.list_recent(limit=limit)
 
-    return {"jobs": [j.to_dict() for j in jobs]}
+    return JSONResponseClass({"jobs": [j.to_dict() for j in jobs]})
 
 
 @app.delete("/api/fetch/{job_id}")
 def api_fetch_delete(job_id: str):
     """Delete a fetch job (only if not running)."""
     store = get_fetch_store()
-    job = store.get(job_id)
+    deleted = store.try_delete(job_id)
 
-    if job and job.status == FetchStatus.RUNNING:
+    if deleted is None:
         return {"error": "Cannot delete a running job"}
 
-    deleted = store.delete(job_id)
-
     return {"deleted": deleted}
 
 
@@ -1502,7 +1748,6 @@ def api_fetch_delete(job_id: str):
 @app.get("/sync", response_class=HTMLResponse)
 def sync_page(request: Request):
     """Unified sync pipeline page."""
-    s = Settings.from_env()
     db = get_db()
 
     # Get pipeline stats
@@ -1516,7 +1761,7 @@ def sync_page(request: Request):
     return render(
         "sync.html",
         request=request,
-        token=s.readwise_api_token,
+        token=SETTINGS.readwise_api_token,
         stats=stats,
         running_job=running_job,
         recent_jobs=recent_jobs,
@@ -1530,7 +1775,7 @@ def sync_start(token: str = Form(...), skip_import: bool = Form(False)):
 
     # Check if already running
     if store.get_running():
-        return {"error": "Pipeline laeuft bereits"}, 400
+        return JSONResponse({"error": "Pipeline laeuft bereits"}, status_code=400)
 
     job = store.create()
     # Store config for stream
@@ -1547,7 +1792,7 @@ def sync_pause(job_id: str):
     store = get_pipeline_store()
     job = store.pause(job_id)
     if not job:
-        return {"error": "Job nicht gefunden oder nicht laufend"}, 404
+        return JSONResponse({"error": "Job nicht gefunden oder nicht laufend"}, status_code=404)
     return {"status": job.status.value, "phase": job.phase.value}
 
 
@@ -1557,7 +1802,7 @@ def sync_cancel(job_id: str):
     store = get_pipeline_store()
     job = store.cancel(job_id)
     if not job:
-        return {"error": "Job nicht gefunden"}, 404
+        return JSONResponse({"error": "Job nicht gefunden"}, status_code=404)
     return {"status": job.status.value}
 
 
@@ -1567,14 +1812,13 @@ async def sync_stream(job_id: str):
     store = get_pipeline_store()
     job = store.get(job_id)
     if not job:
-        return {"error": "Job nicht gefunden"}, 404
+        return JSONResponse({"error": "Job nicht gefunden"}, status_code=404)
 
-    s = Settings.from_env()
-    token = getattr(job, "_token", None) or s.readwise_api_token
+    token = getattr(job, "_token", None) or SETTINGS.readwise_api_token
     skip_import = getattr(job, "_skip_import", False)
 
     if not token:
-        return {"error": "Kein Token verfuegbar"}, 400
+        return JSONResponse({"error": "Kein Token verfuegbar"}, status_code=400)
 
     db = get_db()
 
@@ -1592,10 +1836,10 @@ async def sync_stream(job_id: str):
         except Exception as e:
             import traceback
             logger.error(f"Pipeline error: {e}\n{traceback.format_exc()}")
-            yield f"event: pipeline_failed\ndata: {{\"error\": \"{e}\"}}\n\n"
+            yield sse_message("pipeline_failed", {"error": str(e)})
 
     return StreamingResponse(
-        event_generator(),
+        batch_sse(event_generator()),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -1611,8 +1855,8 @@ def sync_status(job_id: str):
     store = get_pipeline_store()
     job = store.get(job_id)
     if not job:
-        return {"error": "Job nicht gefunden"}, 404
-    return job.to_dict()
+        return JSONResponse({"error": "Job nicht gefunden"}, status_code=404)
+    return _job_status_response(job, job.status in PIPELINE_FINISHED)
 
 
 @app.get("/api/sync/stats")
@@ -1630,11 +1874,13 @@ from app.core.digest_job import (
 )
 from app.core.digest_pipeline import run_digest_pipeline, estimate_digest
 
+DIGEST_FINISHED = frozenset({DigestStatus.COMPLETED, DigestStatus.FAILED})
+
 
 @app.get("/digest", response_class=HTMLResponse)
-def digest_page(request: Request):
+async def digest_page(request: Request):
     """LLM-powered digest page. All data is loaded dynamically via JavaScript."""
-    return render("digest_home.html", request=request)
+    return render_static("digest_home.html")
 
 
 @app.get("/api/digest/estimate")
@@ -1709,10 +1955,10 @@ async def api_digest_stream(job_id: str):
             async for event in run_digest_pipeline(job, db):
                 yield event.to_sse()
         except Exception as e:
-            yield f"event: error\ndata: {{\"error\": \"{e}\"}}\n\n"
+            yield sse_message("error", {"error": str(e)})
 
     return StreamingResponse(
-        event_generator(),
+        batch_sse(event_generator()),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -1731,7 +1977,7 @@ def api_digest_job_status(job_id: str):
     if not job:
         return {"error": "Job nicht gefunden"}
 
-    return job.to_dict()
+    return _job_status_response(job, job.status in DIGEST_FINISHED)
 
 
 @app.get("/api/digest/latest")
@@ -9,10 +9,20 @@ from enum import Enum
 from typing import TYPE_CHECKING, Any, Iterator
 from urllib.parse import urlparse, urlunparse
 
+import threading
 import time
 
 import httpx
 
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from app.core.sse import sse_message
 from app.providers.content_types import Article, Highlight
 
 if TYPE_CHECKING:
@@ -37,15 +47,15 @@ class ImportEvent:
     type: ImportEventType
     data: dict[str, Any]
 
-    def to_sse(self) -> str:
+    def to_sse(self) -> bytes:
         """Format as SSE message."""
-        import json
-
-        return f"event: {self.type.value}\ndata: {json.dumps(self.data)}\n\n"
+        return sse_message(self.type.value, self.data)
 
 logger = logging.getLogger(__name__)
 
 READWISE_BASE_URL = "https://readwise.io/api"
+READWISE_LIMITS = httpx.Limits(max_keepalive_connections=10, max_connections=20)
+READWISE_TIMEOUT = httpx.Timeout(30.0, connect=3.0)
 
 
 def normalize_url(url: str | None) -> str | None:
@@ -96,7 +106,9 @@ class ReadwiseClient:
         self._client = httpx.Client(
             base_url=READWISE_BASE_URL,
             headers={"Authorization": f"Token {token}"},
-            timeout=30.0,
+            http2=HTTP2_AVAILABLE,
+            limits=READWISE_LIMITS,
+            timeout=READWISE_TIMEOUT,
         )
 
     def close(self) -> None:
@@ -501,6 +513,12 @@ class ReadwiseClient:
                 },
             )
 
+        except ReadwiseAuthError:
+            logger.warning("Import failed: Readwise rejected the token")
+            yield self._import_failed(job, "Readwise-Token ungueltig")
+        except (httpx.HTTPError, ReadwiseRateLimitError):
+            logger.warning("Import failed: Readwise unreachable", exc_info=True)
+            yield self._import_failed(job, "Readwise nicht erreichbar")
         except Exception as e:
             job.status = ImportStatus.FAILED
             job.error = str(e)
@@ -510,6 +528,15 @@ class ReadwiseClient:
                 data={"error": str(e)},
             )
 
+    @staticmethod
+    def _import_failed(job: ImportJob, message: str) -> ImportEvent:
+        """Mark job failed with a fixed user-facing message (no exception text)."""
+        from app.core.import_job import ImportStatus
+
+        job.status = ImportStatus.FAILED
+        job.error = message
+        return ImportEvent(type=ImportEventType.ERROR, data={"error": message})
+
     def _stream_reader_api(
         self,
         job: ImportJob,
@@ -753,3 +780,27 @@ class ReadwiseClient:
                 job.export_done = True
                 job.export_cursor = None
                 break
+
+
+# Long-lived clients keyed by token, so repeat syncs reuse pooled
+# keep-alive connections instead of a new TCP+TLS handshake each time.
+_clients: dict[str, ReadwiseClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_readwise_client(token: str) -> ReadwiseClient:
+    """Shared ReadwiseClient for this token. Don't close it; see close_readwise_clients()."""
+    with _clients_lock:
+        client = _clients.get(token)
+        if client is None:
+            client = ReadwiseClient(token=token)
+            _clients[token] = client
+        return client
+
+
+def close_readwise_clients() -> None:
+    """Close all shared clients (app shutdown)."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
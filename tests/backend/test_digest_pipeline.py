@@ -19,7 +19,7 @@ from app.core.digest_job import (
     DigestEventType,
     get_digest_store,
 )
-from app.core.digest_clustering import ClusteringResult, TopicCluster
+from app.core.digest_clustering import ClusteringResult, TopicCluster, _kmeans_cluster
 
 
 @pytest.fixture
@@ -175,6 +175,22 @@ class TestClusterPhase:
             assert digest_job.topics_created == 1
 
 
+class TestKMeans:
+    """Tests for the embedding k-means used by the hybrid strategy."""
+
+    def test_separates_directions_regardless_of_length(self):
+        # Two directions; lengths vary so only cosine similarity groups them
+        embeddings = [[1.0, 0.1, 0.0], [5.0, 0.0, 0.2], [0.3, 0.01, 0.0],
+                      [0.0, 1.0, 0.1], [0.1, 7.0, 0.0], [0.0, 0.2, 0.01]]
+        assignments = _kmeans_cluster(embeddings, k=2)
+        assert len(set(assignments[:3])) == 1
+        assert len(set(assignments[3:])) == 1
+        assert assignments[0] != assignments[3]
+
+    def test_fewer_points_than_clusters(self):
+        assert _kmeans_cluster([[1.0, 0.0], [0.0, 1.0]], k=5) == [0, 1]
+
+
 class TestSummarizePhase:
     """Tests for the summarize phase."""
 
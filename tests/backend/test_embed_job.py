@@ -220,5 +220,35 @@ async def test_generate_embeddings_batch():
     assert result["remaining"] == 0
 
 
+@pytest.mark.asyncio
+async def test_embed_cached_only_sends_misses(db):
+    """Identical texts reuse embedding_cache; only new texts hit the provider."""
+    from app.core.embedding_providers import embed_cached
+
+    provider = MagicMock()
+    provider.model_id = "text-embedding-3-small"
+    calls = []
+
+    async def fake_embed(texts):
+        calls.append(list(texts))
+        return [[float(len(t))] * 4 for t in texts]
+
+    provider.embed = fake_embed
+
+    vectors, sent = await embed_cached(db, provider, "openai", ["alpha", "beta", "alpha"])
+    assert calls == [["alpha", "beta"]]
+    assert sent == [0, 1]
+    assert vectors[0] == vectors[2] == serialize_f32([5.0] * 4)
+
+    vectors, sent = await embed_cached(db, provider, "openai", ["beta", "gamma"])
+    assert calls[-1] == ["gamma"]
+    assert sent == [1]
+    assert vectors[0] == serialize_f32([4.0] * 4)
+
+    # Cache is per provider/model
+    await embed_cached(db, provider, "ollama", ["alpha"])
+    assert calls[-1] == ["alpha"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,6 +1,8 @@
 """Tests for embedding functions."""
 
+import base64
 import os
+from array import array
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -16,6 +18,12 @@ def test_serialize_f32():
     assert len(result) == 12  # 3 floats * 4 bytes
 
 
+def test_serialize_f32_array_passthrough():
+    """float32 arrays are copied as-is and match the list encoding."""
+    vec = [0.5, -1.25, 3.0]
+    assert serialize_f32(array("f", vec)) == serialize_f32(vec)
+
+
 def test_serialize_f32_1536_dimensions():
     """Test serialization with OpenAI embedding dimensions."""
     vec = [0.1] * 1536
@@ -53,6 +61,31 @@ async def test_get_embedding_mocked():
     assert len(result) == 1536
 
 
+@pytest.mark.asyncio
+async def test_get_embedding_base64():
+    """base64 responses decode to a float32 array that serializes as-is."""
+    raw = array("f", [0.25, -0.5, 1.0]).tobytes()
+
+    mock_response = MagicMock()
+    mock_response.json.return_value = {
+        "data": [{"embedding": base64.b64encode(raw).decode(), "index": 0}]
+    }
+    mock_response.raise_for_status = MagicMock()
+    requests = []
+
+    async def mock_post(*args, **kwargs):
+        requests.append(kwargs["json"])
+        return mock_response
+
+    with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}, clear=False):
+        with patch("httpx.AsyncClient.post", side_effect=mock_post):
+            result = await get_embedding("test text")
+
+    assert requests[0]["encoding_format"] == "base64"
+    assert list(result) == [0.25, -0.5, 1.0]
+    assert serialize_f32(result) == raw
+
+
 @pytest.mark.asyncio
 async def test_get_embeddings_batch_empty():
     """Test that empty batch raises ValueError."""
@@ -86,5 +119,30 @@ async def test_get_embeddings_batch_mocked():
     assert result[1] == mock_embeddings[1]
 
 
+@pytest.mark.asyncio
+async def test_embed_parallel_stream_yields_batches_as_completed():
+    """Finished batches are yielded with their start index, fastest first."""
+    import asyncio
+
+    from app.core.embedding_providers import OpenAIProvider
+
+    with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+        provider = OpenAIProvider()
+
+    async def fake_embed(texts):
+        # First batch is the slowest
+        await asyncio.sleep(0.02 if texts[0] == "t0" else 0)
+        return [[float(t[1:])] for t in texts]
+
+    provider.embed = fake_embed
+    texts = [f"t{i}" for i in range(5)]
+
+    results = [r async for r in provider.embed_parallel_stream(texts, batch_size=2, max_concurrent=3)]
+    assert results[-1] == (0, [[0.0], [1.0]])
+    assert sorted(results) == [(0, [[0.0], [1.0]]), (2, [[2.0], [3.0]]), (4, [[4.0]])]
+
+    assert await provider.embed_parallel(texts, batch_size=2) == [[float(i)] for i in range(5)]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
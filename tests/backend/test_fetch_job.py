@@ -116,6 +116,26 @@ class TestFetchJobStore:
         assert retrieved.status == FetchStatus.RUNNING
         assert retrieved.items_processed == 10
 
+    def test_update_throttles_progress_writes(self, db_conn):
+        store = FetchJobStore(db_conn)
+        job = store.create()
+        job.status = FetchStatus.RUNNING
+        store.update(job)
+
+        def persisted_count():
+            return db_conn.execute(
+                "SELECT items_processed FROM fetch_jobs WHERE id = ?", (job.id,)
+            ).fetchone()[0]
+
+        job.items_processed = 1
+        store.update(job)
+        assert persisted_count() == 0  # same status, within PERSIST_INTERVAL
+        assert store.get(job.id).items_processed == 1
+
+        job.status = FetchStatus.COMPLETED
+        store.update(job)
+        assert persisted_count() == 1
+
     def test_pause_job(self, db_conn):
         store = FetchJobStore(db_conn)
         job = store.create()
@@ -193,6 +213,20 @@ class TestFetchJobStore:
         store = FetchJobStore(db_conn)
         assert store.delete("nonexistent") is False
 
+    def test_try_delete_refuses_running_job(self, db_conn):
+        store = FetchJobStore(db_conn)
+        job = store.create()
+        job.status = FetchStatus.RUNNING
+        store.update(job)
+
+        assert store.try_delete(job.id) is None
+        assert store.get(job.id) is job
+
+        job.status = FetchStatus.PAUSED
+        store.update(job)
+        assert store.try_delete(job.id) is True
+        assert store.get(job.id) is None
+
 
 class TestFetchEvent:
     """Tests for FetchEvent."""
@@ -204,10 +238,10 @@ class TestFetchEvent:
             data={"items_processed": 50},
         )
         sse = event.to_sse()
-        assert "event: progress" in sse
-        assert "data:" in sse
-        assert "test-123" in sse
-        assert sse.endswith("\n\n")
+        assert b"event: progress" in sse
+        assert b"data:" in sse
+        assert b"test-123" in sse
+        assert sse.endswith(b"\n\n")
 
 
 class TestDomainRateLimiter:
@@ -0,0 +1,144 @@
+"""Tests for the search result and query embedding caches."""
+
+import asyncio
+import struct
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core import query_cache
+from app.core.query_cache import (
+    clear_search_cache,
+    get_query_embedding_cached,
+    search_documents_cached,
+    semantic_search_cached,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_search_cache()
+    query_cache._embeddings.clear()
+    yield
+    clear_search_cache()
+    query_cache._embeddings.clear()
+
+
+def test_repeated_query_hits_cache():
+    db = MagicMock()
+    db.search_documents.return_value = [{"id": 1}]
+
+    assert search_documents_cached(db, "AI ", limit=10) == [{"id": 1}]
+    assert search_documents_cached(db, " AI", limit=10) == [{"id": 1}]
+    db.search_documents.assert_called_once_with("AI ", limit=10)
+
+
+def test_fts_operator_case_is_part_of_key():
+    db = MagicMock()
+    db.search_documents.side_effect = [[{"id": 1}, {"id": 2}, {"id": 3}], [{"id": 1}]]
+
+    assert len(search_documents_cached(db, "alpha OR beta")) == 3
+    assert len(search_documents_cached(db, "alpha or beta")) == 1
+    assert db.search_documents.call_count == 2
+
+
+def test_limit_is_part_of_key():
+    db = MagicMock()
+    db.search_documents.return_value = []
+
+    search_documents_cached(db, "ai", limit=10)
+    search_documents_cached(db, "ai", limit=100)
+    assert db.search_documents.call_count == 2
+
+
+def test_expired_and_cleared_entries_are_refetched(monkeypatch):
+    db = MagicMock()
+    db.search_documents.return_value = []
+
+    search_documents_cached(db, "ai")
+    monkeypatch.setattr(query_cache, "CACHE_TTL_SECONDS", -1.0)
+    clear_search_cache()
+    search_documents_cached(db, "ai")
+    search_documents_cached(db, "ai")
+    assert db.search_documents.call_count == 3
+
+
+def test_lru_eviction(monkeypatch):
+    monkeypatch.setattr(query_cache, "CACHE_MAX_ENTRIES", 2)
+    db = MagicMock()
+    db.search_documents.return_value = []
+
+    for q in ("a", "b", "c"):
+        search_documents_cached(db, q)
+    search_documents_cached(db, "a")
+    assert db.search_documents.call_count == 4
+
+
+async def test_query_embedding_cached_per_normalized_text(monkeypatch):
+    calls = []
+
+    async def fake_embedding(text):
+        calls.append(text)
+        return [0.5, 1.0]
+
+    monkeypatch.setattr(query_cache, "get_embedding", fake_embedding)
+
+    first = await get_query_embedding_cached("  neural   nets ")
+    second = await get_query_embedding_cached("neural nets")
+    assert first == second == struct.pack("2f", 0.5, 1.0)
+    assert calls == ["neural nets"]
+
+
+async def test_query_embedding_keyed_by_model(monkeypatch):
+    calls = []
+
+    async def fake_embedding(text):
+        calls.append(text)
+        return [0.0]
+
+    monkeypatch.setattr(query_cache, "get_embedding", fake_embedding)
+
+    await get_query_embedding_cached("ai")
+    monkeypatch.setenv("EMBEDDING_MODEL", "text-embedding-3-large")
+    await get_query_embedding_cached("ai")
+    assert len(calls) == 2
+
+
+async def test_concurrent_misses_share_one_request(monkeypatch):
+    calls = []
+
+    async def fake_embedding(text):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return [1.0]
+
+    monkeypatch.setattr(query_cache, "get_embedding", fake_embedding)
+
+    first, second = await asyncio.gather(
+        get_query_embedding_cached("ai"), get_query_embedding_cached("ai")
+    )
+    assert first == second
+    assert calls == ["ai"]
+    assert query_cache._inflight == {}
+
+
+async def test_semantic_search_cached_skips_embedding_and_search(monkeypatch):
+    calls = []
+
+    async def fake_embedding(text):
+        calls.append(text)
+        return [1.0]
+
+    monkeypatch.setattr(query_cache, "get_embedding", fake_embedding)
+    db = MagicMock()
+    db.semantic_search.return_value = [{"id": 7}]
+
+    assert await semantic_search_cached(db, "neural nets", limit=5) == [{"id": 7}]
+    query_cache._embeddings.clear()
+    assert await semantic_search_cached(db, " neural  nets", limit=5) == [{"id": 7}]
+    assert calls == ["neural nets"]
+    db.semantic_search.assert_called_once()
+
+    clear_search_cache()
+    await semantic_search_cached(db, "neural nets", limit=5)
+    assert db.semantic_search.call_count == 2
@@ -0,0 +1,54 @@
+"""Tests for the Readwise Reader client."""
+
+import httpx
+
+from app.core.import_job import ImportJob, ImportStatus
+from app.providers.readwise import (
+    HTTP2_AVAILABLE,
+    ImportEventType,
+    READWISE_BASE_URL,
+    ReadwiseClient,
+    close_readwise_clients,
+    get_readwise_client,
+)
+
+
+def _client(handler) -> ReadwiseClient:
+    client = ReadwiseClient(token="test-token")
+    client._client = httpx.Client(
+        base_url=READWISE_BASE_URL, transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def test_shared_client_per_token():
+    try:
+        first = get_readwise_client("token-a")
+        assert get_readwise_client("token-a") is first
+        assert get_readwise_client("token-b") is not first
+    finally:
+        close_readwise_clients()
+    assert get_readwise_client("token-a") is not first
+    close_readwise_clients()
+
+
+def test_client_uses_http2_when_available():
+    client = ReadwiseClient(token="test-token")
+    try:
+        assert client._client._transport._pool._http2 is HTTP2_AVAILABLE
+    finally:
+        client.close()
+
+
+def test_stream_import_reports_static_error_message():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("secret internals", request=request)
+
+    job = ImportJob(id="job1", status=ImportStatus.PENDING)
+    with _client(handler) as client:
+        events = list(client.stream_import(job))
+
+    assert events[-1].type == ImportEventType.ERROR
+    assert events[-1].data == {"error": "Readwise nicht erreichbar"}
+    assert job.status == ImportStatus.FAILED
+    assert job.error == "Readwise nicht erreichbar"
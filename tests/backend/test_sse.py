@@ -0,0 +1,57 @@
+"""Tests for SSE message formatting."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.core.sse import batch_sse, sse_message
+from app.providers.readwise import ImportEvent, ImportEventType
+
+
+def test_sse_message_format():
+    msg = sse_message("progress", {"done": 3, "title": "Über"})
+    assert isinstance(msg, bytes)
+    event_line, data_line, *rest = msg.split(b"\n")
+    assert event_line == b"event: progress"
+    assert json.loads(data_line.removeprefix(b"data: ")) == {"done": 3, "title": "Über"}
+    assert rest == [b"", b""]
+
+
+def test_import_event_to_sse():
+    event = ImportEvent(type=ImportEventType.ERROR, data={"error": "x"})
+    assert event.to_sse() == sse_message("error", {"error": "x"})
+
+
+def test_sse_message_escapes_error_text():
+    msg = sse_message("error", {"error": 'bad "quote"\nnext line'})
+    data_line = msg.split(b"\n")[1]
+    assert json.loads(data_line.removeprefix(b"data: ")) == {"error": 'bad "quote"\nnext line'}
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_batch_sse_coalesces_burst():
+    async def burst():
+        for i in range(5):
+            yield sse_message("progress", {"i": i})
+
+    chunks = await _collect(batch_sse(burst()))
+    assert chunks == [b"".join(sse_message("progress", {"i": i}) for i in range(5))]
+
+
+@pytest.mark.asyncio
+async def test_batch_sse_flushes_after_delay_and_size():
+    async def slow():
+        yield b"a"
+        yield b"b"
+        await asyncio.sleep(0.05)
+        yield b"c"
+        yield b"x" * 10
+        yield b"d"
+
+    chunks = await _collect(batch_sse(slow(), max_bytes=8, max_delay=0.01))
+    assert chunks == [b"ab", b"c" + b"x" * 10, b"d"]
@@ -0,0 +1,448 @@
+"""Tests for storage.py DB methods."""
+
+import sqlite3
+import struct
+
+import pytest
+import sqlite_vec
+
+from app.core.storage import DB, MMAP_SIZE, ConnectionPool
+
+
+@pytest.fixture
+def db():
+    """Create an in-memory database for testing."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    sqlite_vec.load(conn)
+    database = DB(conn=conn)
+    database.init()
+    return database
+
+
+class TestFtsTriggers:
+    """FTS index is maintained by triggers, without rebuild_fts()."""
+
+    def test_insert_is_searchable(self, db):
+        db.save_article(
+            source="test",
+            provider_id="doc1",
+            url_original="https://example.com/1",
+            title="Quantum gardening",
+            fulltext="Notes about photosynthesis",
+        )
+        results = db.search_documents("photosynthesis")
+        assert [r["title"] for r in results] == ["Quantum gardening"]
+        assert set(results[0]) == {"id", "title", "author", "url", "saved_at"}
+
+    def test_update_replaces_tokens(self, db):
+        db.save_article(
+            source="test",
+            provider_id="doc1",
+            url_original="https://example.com/1",
+            title="Old title",
+            fulltext="first version",
+        )
+        db.save_article(
+            source="test",
+            provider_id="doc1",
+            url_original="https://example.com/1",
+            title="New title",
+            fulltext="second version",
+        )
+        assert db.search_documents("first") == []
+        assert len(db.search_documents("second")) == 1
+
+    def test_delete_removes_tokens(self, db):
+        doc_id = db.save_article(
+            source="test",
+            provider_id="doc1",
+            url_original="https://example.com/1",
+            title="Ephemeral",
+        )
+        db.conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+        db.conn.commit()
+        assert db.search_documents("Ephemeral") == []
+        db.conn.execute("INSERT INTO documents_fts(documents_fts) VALUES('integrity-check')")
+
+    def test_rebuild_fts_keeps_triggers_consistent(self, db):
+        db.save_article(
+            source="test",
+            provider_id="doc1",
+            url_original="https://example.com/1",
+            title="Alpha",
+        )
+        assert db.rebuild_fts() == 1
+        db.save_article(
+            source="test",
+            provider_id="doc1",
+            url_original="https://example.com/1",
+            title="Beta",
+        )
+        assert db.search_documents("Alpha") == []
+        assert len(db.search_documents("Beta")) == 1
+
+    def test_optimize_fts_keeps_index_searchable(self, tmp_path):
+        conn = sqlite3.connect(str(tmp_path / "app.db"), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        sqlite_vec.load(conn)
+        database = DB(conn=conn)
+        database.init()
+        for i in range(3):
+            with database.conn:
+                database.save_article(
+                    source="test", provider_id=f"doc{i}", url_original=None, title=f"Segment {i}"
+                )
+
+        database.optimize_fts()
+
+        assert len(database.search_documents("Segment")) == 3
+        assert database.count_fts_documents() == 3
+
+    def test_optimize_fts_skips_in_memory_db(self, db):
+        db.optimize_fts()
+
+
+class TestConnectionPool:
+    """Read-only pool alongside the single writer connection."""
+
+    def test_reader_sees_committed_writes(self, tmp_path):
+        db_path = str(tmp_path / "app.db")
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        sqlite_vec.load(conn)
+        database = DB(conn=conn)
+        database.init()
+        database.pool = ConnectionPool(db_path, max_readers=2)
+
+        with database.conn:
+            database.create_digest(name="AI", query="llm")
+
+        assert [d["name"] for d in database.list_digests()] == ["AI"]
+        with database.reader() as reader:
+            assert reader is not database.conn
+            with pytest.raises(sqlite3.OperationalError):
+                reader.execute("DELETE FROM digests")
+        database.pool.close()
+
+    def test_reader_without_pool_uses_writer(self, db):
+        with db.reader() as conn:
+            assert conn is db.conn
+
+    def test_readers_are_memory_mapped(self, tmp_path):
+        db_path = str(tmp_path / "app.db")
+        conn = sqlite3.connect(db_path)
+        sqlite_vec.load(conn)
+        DB(conn=conn).init()
+        pool = ConnectionPool(db_path, max_readers=1)
+
+        with pool.connection() as reader:
+            assert reader.execute("PRAGMA mmap_size").fetchone()[0] == MMAP_SIZE
+            assert reader.execute("PRAGMA temp_store").fetchone()[0] == 2
+        pool.close()
+
+    def test_sqlite_vec_loaded_on_demand(self, tmp_path):
+        db_path = str(tmp_path / "app.db")
+        conn = sqlite3.connect(db_path)
+        sqlite_vec.load(conn)
+        DB(conn=conn).init()
+        pool = ConnectionPool(db_path, max_readers=1)
+
+        with pool.connection() as reader:
+            with pytest.raises(sqlite3.OperationalError):
+                reader.execute("SELECT vec_version()")
+        with pool.connection(vec=True) as reader:
+            assert reader.execute("SELECT vec_version()").fetchone()[0]
+        pool.close()
+
+
+class TestHostTimestamps:
+    """save_article/set_setting bind a host-side timestamp."""
+
+    def test_save_article_uses_given_now(self, db):
+        doc_id = db.save_article(
+            source="test",
+            provider_id="doc1",
+            url_original="https://example.com/1",
+            title="Stamped",
+            fulltext="body",
+            now="2024-01-02 03:04:05",
+        )
+        row = db.conn.execute(
+            "SELECT created_at, updated_at, fulltext_fetched_at FROM documents WHERE id = ?",
+            (doc_id,),
+        ).fetchone()
+        assert tuple(row) == ("2024-01-02 03:04:05",) * 3
+
+    def test_upsert_refreshes_updated_at_only(self, db):
+        kwargs = dict(source="test", provider_id="doc1", url_original=None, title="T")
+        doc_id = db.save_article(**kwargs, now="2024-01-01 00:00:00")
+        db.save_article(**kwargs, now="2024-02-01 00:00:00")
+        row = db.conn.execute(
+            "SELECT created_at, updated_at FROM documents WHERE id = ?", (doc_id,)
+        ).fetchone()
+        assert tuple(row) == ("2024-01-01 00:00:00", "2024-02-01 00:00:00")
+
+
+class TestDocumentLookupIndexes:
+    """Dedup/UPSERT lookups are index-only (the rowid id rides along)."""
+
+    @pytest.mark.parametrize(
+        "table, where",
+        [
+            ("documents", "source = ? AND url_canonical = ?"),
+            ("documents", "source = ? AND provider_id = ?"),
+            ("highlights", "document_id = ? AND text_hash = ?"),
+        ],
+    )
+    def test_lookup_uses_index(self, db, table, where):
+        plan = db.conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT id FROM {table} WHERE {where}", ("a", "b")
+        ).fetchall()
+        detail = " ".join(row[3] for row in plan)
+        assert "USING COVERING INDEX" in detail
+
+    def test_documents_without_embedding_seeks_by_document(self, db):
+        plan = db.conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT d.id FROM documents d
+            LEFT JOIN embeddings e ON e.document_id = d.id AND e.provider = ? AND e.model = ?
+            WHERE e.id IS NULL
+            """,
+            ("openai", "m"),
+        ).fetchall()
+        detail = " ".join(row[3] for row in plan)
+        assert "idx_embeddings_document_provider_model" in detail
+
+    def test_html_cleanup_uses_partial_index(self, db):
+        plan = db.conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT COUNT(*) FROM documents
+            WHERE fulltext IS NOT NULL
+              AND fulltext != ''
+              AND (fulltext LIKE '<%' OR fulltext LIKE '%<p>%' OR fulltext LIKE '%<div>%')
+              AND fulltext_html IS NULL
+            """
+        ).fetchall()
+        detail = " ".join(row[3] for row in plan)
+        assert "idx_documents_html_fulltext" in detail
+
+    @pytest.mark.parametrize("table", ["import_jobs", "fetch_jobs", "embed_jobs"])
+    def test_recent_jobs_skip_sort(self, db, table):
+        plan = db.conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT * FROM {table} ORDER BY started_at DESC LIMIT 10"
+        ).fetchall()
+        detail = " ".join(row[3] for row in plan)
+        assert "USE TEMP B-TREE" not in detail
+
+
+class TestCounters:
+    """get_stats() reads trigger-maintained counters."""
+
+    def test_counts_follow_inserts_and_deletes(self, db):
+        assert db.get_stats() == {"documents": 0, "drafts": 0, "highlights": 0}
+        doc_id = db.save_article(
+            source="test", provider_id="doc1", url_original=None, title="T"
+        )
+        db.save_highlight(document_id=doc_id, provider_highlight_id="h1", text="quote")
+        db.save_highlight(document_id=doc_id, provider_highlight_id="h1", text="quote")
+        assert db.get_stats() == {"documents": 1, "drafts": 0, "highlights": 1}
+
+        db.conn.execute("DELETE FROM highlights")
+        db.conn.execute("DELETE FROM documents")
+        assert db.get_stats() == {"documents": 0, "drafts": 0, "highlights": 0}
+
+    def test_existing_rows_are_seeded(self, db):
+        db.save_article(source="test", provider_id="doc1", url_original=None, title="T")
+        db.conn.execute("DROP TRIGGER highlights_count_ad")
+        db.conn.execute("DELETE FROM counters")
+        db.init()
+        assert db.get_stats()["documents"] == 1
+
+
+class TestSaveHighlights:
+    """save_highlights() batches the same upsert as save_highlight()."""
+
+    def test_batch_dedups_by_text(self, db):
+        doc_id = db.save_article(source="test", provider_id="doc1", url_original=None, title="T")
+        db.save_highlight(document_id=doc_id, provider_highlight_id="h1", text="Same quote")
+        db.save_highlights(
+            doc_id,
+            [
+                {"provider_highlight_id": "h2", "text": "Same quote", "note": "n"},
+                {"provider_highlight_id": "h3", "text": "Other quote"},
+            ],
+        )
+
+        highlights = db.get_highlights_for_document(doc_id)
+        assert sorted((h["text"], h["note"]) for h in highlights) == [
+            ("Other quote", None),
+            ("Same quote", "n"),
+        ]
+        assert db.get_stats()["highlights"] == 2
+
+
+class TestListQueries:
+    """List queries build dicts straight from sqlite3.Row."""
+
+    def test_list_digests_defaults_mode(self, db):
+        db.conn.execute("INSERT INTO digests(name, query, mode) VALUES('a', 'q', NULL)")
+        assert db.list_digests()[0]["mode"] == "fts"
+
+    def test_highlights_for_document(self, db):
+        doc_id = db.save_article(source="test", provider_id="doc1", url_original=None, title="T")
+        db.save_highlight(document_id=doc_id, provider_highlight_id="h1", text="quote", note="n")
+        (hl,) = db.get_highlights_for_document(doc_id)
+        assert hl == {
+            "id": hl["id"],
+            "text": "quote",
+            "note": "n",
+            "highlighted_at": None,
+            "provider": None,
+        }
+
+
+class TestSaveChunks:
+    """save_chunks() inserts a document's chunks in one executemany."""
+
+    @staticmethod
+    def _chunks(*texts):
+        return [
+            {"chunk_index": i, "chunk_text": t, "char_start": 0, "char_end": len(t)}
+            for i, t in enumerate(texts)
+        ]
+
+    def test_rechunk_replaces_and_returns_ids_in_order(self, db):
+        doc_id = db.save_article(source="test", provider_id="doc", url_original=None, title="T")
+        with db.conn:
+            db.save_chunks(doc_id, self._chunks("old"))
+            ids = db.save_chunks(doc_id, self._chunks("a", "b"))
+
+        assert [c["chunk_text"] for c in db.get_chunks_for_document(doc_id)] == ["a", "b"]
+        assert ids == [c["id"] for c in db.get_chunks_for_document(doc_id)]
+
+    def test_insert_chunks_spans_documents(self, db):
+        a = db.save_article(source="test", provider_id="a", url_original=None, title="A")
+        b = db.save_article(source="test", provider_id="b", url_original=None, title="B")
+        with db.conn:
+            db.insert_chunks(
+                [(a, c) for c in self._chunks("a1", "a2")] + [(b, c) for c in self._chunks("b1")]
+            )
+
+        assert [c["chunk_text"] for c in db.get_chunks_for_document(a)] == ["a1", "a2"]
+        assert [c["chunk_text"] for c in db.get_chunks_for_document(b)] == ["b1"]
+
+
+class TestQuantizedVectors:
+    """int8 vec0 tables with exact float32 re-ranking."""
+
+    @staticmethod
+    def _vec(*head: float) -> bytes:
+        values = list(head) + [0.0] * (768 - len(head))
+        return struct.pack(f"{len(values)}f", *values)
+
+    def _save(self, db, doc_id, embedding):
+        return db.save_embedding_v2(
+            embedding=embedding,
+            dimensions=768,
+            provider="ollama",
+            model="nomic-embed-text",
+            document_id=doc_id,
+        )
+
+    def test_search_returns_exact_distances(self, db):
+        near = db.save_article(source="test", provider_id="near", url_original=None, title="Near")
+        far = db.save_article(source="test", provider_id="far", url_original=None, title="Far")
+        self._save(db, near, self._vec(3.0, 4.0))
+        self._save(db, far, self._vec(-3.0, 4.0))
+
+        results = db.semantic_search_v2(self._vec(3.0, 4.0), 768, limit=2)
+        assert [r["title"] for r in results] == ["Near", "Far"]
+        assert results[0]["distance"] == pytest.approx(0.0)
+        assert results[1]["distance"] == pytest.approx(6.0)
+
+    def test_float_tables_are_converted(self, db):
+        doc_id = db.save_article(source="test", provider_id="doc", url_original=None, title="T")
+        self._save(db, doc_id, self._vec(1.0))
+        db.conn.execute("DROP TABLE embeddings_768")
+        db.conn.execute(
+            "CREATE VIRTUAL TABLE embeddings_768 USING vec0("
+            "embedding float[768], +embedding_id INTEGER)"
+        )
+        db.init()
+
+        sql = db.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'embeddings_768'"
+        ).fetchone()[0]
+        assert "int8[768]" in sql
+        assert len(db.knn_search(self._vec(1.0), 768, k=1)) == 1
+
+    def test_chunk_search_batches_details_and_context(self, db):
+        doc_id = db.save_article(source="test", provider_id="doc", url_original=None, title="Doc")
+        with db.conn:
+            chunk_ids = db.save_chunks(
+                doc_id,
+                [
+                    {"chunk_index": i, "chunk_text": t, "char_start": 0, "char_end": 1}
+                    for i, t in enumerate(["intro", "middle", "outro"])
+                ],
+            )
+        for chunk_id, head in zip(chunk_ids, (1.0, 2.0, 3.0)):
+            db.save_embedding_v2(
+                embedding=self._vec(head, 1.0),
+                dimensions=768,
+                provider="ollama",
+                model="nomic-embed-text",
+                chunk_id=chunk_id,
+            )
+
+        results = db.semantic_search_with_chunks(self._vec(2.0, 1.0), 768, limit=2)
+        assert [r["chunk_text"] for r in results] == ["middle", "intro"]
+        assert (results[0]["context_before"], results[0]["context_after"]) == ("intro", "outro")
+        assert (results[1]["context_before"], results[1]["context_after"]) == ("", "middle")
+
+        (doc,) = db.search_library_semantic(self._vec(3.0, 1.0), 768, limit=5)
+        assert doc["chunk_text"] == "outro"
+        assert [c["chunk_text"] for c in doc["matching_chunks"]] == ["middle", "intro"]
+
+    @staticmethod
+    def _vec1536(*head: float) -> bytes:
+        values = list(head) + [0.0] * (1536 - len(head))
+        return struct.pack(f"{len(values)}f", *values)
+
+    def test_legacy_search_returns_exact_distances(self, db):
+        near = db.save_article(source="test", provider_id="near", url_original=None, title="Near")
+        far = db.save_article(source="test", provider_id="far", url_original=None, title="Far")
+        db.save_embedding(near, self._vec1536(3.0, 4.0))
+        db.save_embedding(far, self._vec1536(-3.0, 4.0))
+
+        results = db.semantic_search(self._vec1536(3.0, 4.0), limit=2)
+        assert [r["title"] for r in results] == ["Near", "Far"]
+        assert [r["distance"] for r in results] == pytest.approx([0.0, 6.0])
+
+    def test_legacy_float_table_is_converted(self, db):
+        doc_id = db.save_article(source="test", provider_id="doc", url_original=None, title="T")
+        db.conn.execute("DROP TABLE doc_embeddings")
+        db.conn.execute(
+            "CREATE VIRTUAL TABLE doc_embeddings USING vec0("
+            "embedding float[1536], document_id integer)"
+        )
+        db.conn.execute(
+            "INSERT INTO doc_embeddings (embedding, document_id) VALUES (?, ?)",
+            (self._vec1536(1.0), doc_id),
+        )
+        db.init()
+
+        (result,) = db.semantic_search(self._vec1536(1.0), limit=1)
+        assert result["id"] == doc_id
+        assert result["distance"] == pytest.approx(0.0)
+
+
+
+class TestEmbeddingCache:
+    def test_cache_embeddings_commits_on_its_own(self, db):
+        db.cache_embeddings("openai", "m", {b"h1": b"v1"})
+        db.conn.rollback()
+        assert db.get_cached_embeddings("openai", "m", [b"h1", b"h2"]) == {b"h1": b"v1"}